@@ -0,0 +1,114 @@
+"""Shared measurement, reporting, and comparison helpers for the benchmark scripts."""
+
+import json
+import platform
+import sys
+import tracemalloc
+
+from datetime import datetime
+from pathlib import Path
+from timeit import Timer
+
+
+here = Path(__file__).resolve().parent
+sys.path[:0] = [str(here.parent), str(here.parent / 'test')]  # The package under test, and the sample controllers.
+
+
+def measure(fn, repeat=5, target=0.2):
+	"""Time the given zero-argument callable, returning the best observed duration of a single call, in seconds.
+	
+	The number of calls per timing run is calibrated so that each run takes at least the target duration.
+	"""
+	
+	timer = Timer(fn)
+	number = 1
+	
+	while True:
+		elapsed = timer.timeit(number)
+		
+		if elapsed >= target:
+			break
+		
+		number = max(number * 2, int(number * target / elapsed * 1.1) if elapsed else number * 10)
+	
+	return min([elapsed] + timer.repeat(repeat - 1, number)) / number
+
+
+def allocation(fn, number=100):
+	"""Measure the memory blocks and bytes allocated, and retained by the result of, a single call, on average."""
+	
+	fn()  # Populate any caches; we're interested in steady-state behaviour.
+	results = [None] * number
+	
+	tracemalloc.start()
+	
+	try:
+		before = tracemalloc.take_snapshot()
+		
+		for i in range(number):
+			results[i] = fn()
+		
+		after = tracemalloc.take_snapshot()
+	
+	finally:
+		tracemalloc.stop()
+	
+	stats = after.compare_to(before, 'filename')
+	
+	return sum(i.count_diff for i in stats) / number, sum(i.size_diff for i in stats) / number
+
+
+def environment():
+	"""Describe the environment the benchmark was run within, for inclusion in machine-readable results."""
+	
+	from web.dispatch.object.release import version
+	
+	return {
+			'package': version,
+			'python': platform.python_version(),
+			'implementation': platform.python_implementation(),
+			'platform': platform.platform(),
+			'optimize': sys.flags.optimize,
+			'timestamp': datetime.utcnow().isoformat() + 'Z',
+		}
+
+
+def report(results, output=None):
+	"""Display human-readable results, and optionally write all results as JSON to the given path."""
+	
+	width = max(len(name) for name in results) if results else 0
+	
+	for name, result in results.items():
+		print("{name:<{width}}  {usec:>10.3f} us  {rate:>12,.0f}/s{memory}".format(
+				name = name,
+				width = width,
+				usec = result['seconds'] * 1e6,
+				rate = 1 / result['seconds'],
+				memory = "  {blocks:>8.1f} blocks  {bytes:>10.1f} bytes".format(**result) if 'blocks' in result else "",
+			))
+	
+	if output:
+		Path(output).write_text(json.dumps({'environment': environment(), 'results': results}, indent='\t'))
+
+
+def compare(results, baseline, threshold=0.1):
+	"""Compare results against a previously recorded JSON file, returning the names of regressed measurements.
+	
+	A measurement has regressed if it is slower than the baseline by more than the given fraction.
+	"""
+	
+	previous = json.loads(Path(baseline).read_text())['results']
+	regressions = []
+	
+	for name, result in results.items():
+		if name not in previous:
+			continue
+		
+		delta = result['seconds'] / previous[name]['seconds'] - 1
+		
+		if delta > threshold:
+			regressions.append(name)
+		
+		print("{name}: {delta:+.1%}{flag}".format(name=name, delta=delta, flag=" REGRESSION" if delta > threshold else ""))
+	
+	return regressions
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+"""Measure first-request latency and private memory of forked workers, with and without warming in the master.
+
+Run from the project root, on Linux:
+	
+	python benchmark/prefork.py --width 100 --depth 50
+
+For each strategy a fresh master process builds a dispatcher and synthetic tree, optionally warms it, then forks a
+worker. The worker times its first dispatch of every endpoint path, collects garbage, as a long-running worker
+eventually would, and reports the memory it no longer shares with the master ("private dirty" pages).
+"""
+
+import gc
+import json
+import os
+
+from argparse import ArgumentParser
+from pathlib import Path
+from time import perf_counter
+
+from common import environment
+from tree import generate, paths
+
+from web.dispatch.object import ObjectDispatch
+
+
+STRATEGIES = {  # Arguments to warm, or None to leave each worker to populate its own caches.
+		'cold': None,
+		'warm': {'freeze': False},
+		'frozen': {'freeze': True},
+	}
+
+
+def private():
+	"""Return the private dirty memory of the current process, in kilobytes, or None if unavailable."""
+	
+	try:
+		rollup = Path('/proc/self/smaps_rollup').read_text()
+	except OSError:
+		return None
+	
+	return sum(int(line.split()[1]) for line in rollup.splitlines() if line.startswith('Private_Dirty:'))
+
+
+def worker(dispatch, root, every):
+	start = perf_counter()
+	
+	for path in every:
+		dispatch.resolve(None, root, path)
+	
+	elapsed = perf_counter() - start
+	gc.collect()
+	
+	return {'first': elapsed / len(every), 'private': private()}
+
+
+def measure(strategy, width, depth):
+	"""Run a master process, which forks a single worker, returning the worker's measurements."""
+	
+	reader, writer = os.pipe()
+	master = os.fork()
+	
+	if not master:  # Within the master; we isolate each strategy in its own process tree.
+		os.close(reader)
+		root, _ = generate(width, depth, width * depth)
+		every = list(paths(width, depth))
+		dispatch = ObjectDispatch(cache=width * depth * 4, static=True)
+		
+		if STRATEGIES[strategy] is not None:
+			dispatch.warm(root, **STRATEGIES[strategy])
+		
+		child = os.fork()
+		
+		if not child:
+			os.write(writer, json.dumps(worker(dispatch, root, every)).encode())
+			os._exit(0)
+		
+		os.waitpid(child, 0)
+		os._exit(0)
+	
+	os.close(writer)
+	
+	with os.fdopen(reader) as stream:
+		result = json.loads(stream.read())
+	
+	os.waitpid(master, 0)
+	
+	return result
+
+
+def main(argv=None):
+	parser = ArgumentParser(description=__doc__.partition('\n\n')[0])
+	parser.add_argument('--json', metavar='PATH', help="write machine-readable results to the given file")
+	parser.add_argument('--width', type=int, default=100, help="synthetic tree width")
+	parser.add_argument('--depth', type=int, default=50, help="synthetic tree depth")
+	args = parser.parse_args(argv)
+	
+	results = {strategy: measure(strategy, args.width, args.depth) for strategy in STRATEGIES}
+	
+	for strategy, result in results.items():
+		print("{strategy:<8}  first request {usec:>10.3f} us  private {private} kB after collection".format(
+				strategy = strategy,
+				usec = result['first'] * 1e6,
+				private = result['private'],
+			))
+	
+	if args.json:
+		Path(args.json).write_text(json.dumps({'environment': environment(), 'results': results}, indent='\t'))
+
+
+if __name__ == '__main__':
+	raise SystemExit(main())
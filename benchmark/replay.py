@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+
+"""Replay recorded request paths against a root controller, reporting throughput and latency percentiles per prefix.
+
+Run from the project root, giving the root controller by dotted path and any number of logs:
+	
+	python benchmark/replay.py crudlike.Root access.log --processes 4 --cache 16384 --json replay.json
+
+Logs may list one path per line, or be access logs in the common or combined formats, from which the path of each
+request is extracted; query strings are discarded, and lines which are neither are ignored. The paths are divided
+between worker processes, each of which constructs its own dispatcher, replays its share once to warm up, then replays
+it again, timing every dispatch. Latencies are grouped by the first `--depth` elements of each path.
+"""
+
+import json
+import os
+import re
+import sys
+
+from argparse import ArgumentParser
+from array import array
+from importlib import import_module
+from math import ceil
+from multiprocessing import Pool
+from pathlib import Path
+from time import perf_counter
+from urllib.parse import unquote
+
+from common import environment
+
+from web.dispatch.object import ObjectDispatch
+
+
+sys.path.append(os.getcwd())  # Permit the root controller to be imported from the working directory.
+
+REQUEST = re.compile(r'"[A-Z]+ (\S+)[^"]*"')  # The request line of a common or combined format log entry.
+
+
+def load(reference):
+	"""Import the object referenced in `package.module.name` or `package.module:qualified.name` form."""
+	
+	if ':' in reference:
+		module, _, name = reference.partition(':')
+	else:
+		module, _, name = reference.rpartition('.')
+	
+	obj = import_module(module)
+	
+	for part in name.split('.'):
+		obj = getattr(obj, part)
+	
+	return obj
+
+
+def extract(line):
+	"""Extract the request path from a line of a log, or return None if the line contains none."""
+	
+	match = REQUEST.search(line)
+	
+	if match:
+		path = match.group(1)
+	elif line.startswith('/'):
+		path = line.split(None, 1)[0]
+	else:
+		return None
+	
+	return unquote(path.partition('?')[0])
+
+
+def prefix(path, depth):
+	"""The grouping of the given path: its first `depth` non-empty elements."""
+	
+	return '/' + '/'.join([i for i in path.split('/') if i][:depth])
+
+
+def replay(task):
+	"""Within a worker process, replay the given paths, returning the latencies observed, grouped by prefix."""
+	
+	reference, options, mode, depth, paths = task
+	root = load(reference)
+	dispatch = ObjectDispatch(**options)
+	
+	if mode == 'resolve':
+		invoke = lambda path: dispatch.resolve(None, root, path)
+	else:
+		invoke = lambda path: list(dispatch(None, root, path))
+	
+	for path in paths:  # Warm-up, populating any caches, as a long-running worker would have.
+		invoke(path)
+	
+	groups = {}
+	durations = array('d', bytes(8 * len(paths)))
+	start = perf_counter()
+	
+	for index, path in enumerate(paths):
+		began = perf_counter()
+		invoke(path)
+		durations[index] = perf_counter() - began
+	
+	elapsed = perf_counter() - start
+	
+	for path, duration in zip(paths, durations):
+		group = prefix(path, depth)
+		
+		if group not in groups:
+			groups[group] = array('d')
+		
+		groups[group].append(duration)
+	
+	return elapsed, groups
+
+
+def percentile(ordered, fraction):
+	"""The value below which the given fraction of the sorted values fall, using the nearest-rank method."""
+	
+	return ordered[max(0, ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(durations):
+	ordered = sorted(durations)
+	
+	return {
+			'count': len(ordered),
+			'p50': percentile(ordered, 0.50),
+			'p95': percentile(ordered, 0.95),
+			'p99': percentile(ordered, 0.99),
+		}
+
+
+def main(argv=None):
+	parser = ArgumentParser(description=__doc__.partition('\n\n')[0])
+	parser.add_argument('root', help="the root controller, by dotted path, e.g. myapp.controllers.Root")
+	parser.add_argument('logs', nargs='+', metavar='LOG', help="files listing paths, or access logs, to replay")
+	parser.add_argument('--json', metavar='PATH', help="write machine-readable results to the given file")
+	parser.add_argument('--processes', type=int, default=os.cpu_count(), help="worker processes to replay within")
+	parser.add_argument('--depth', type=int, default=1, help="path elements by which latencies are grouped")
+	parser.add_argument('--top', type=int, default=20, help="prefixes to display, most frequent first")
+	parser.add_argument('--mode', choices=('resolve', 'iterate'), default='resolve', help="method of dispatch")
+	parser.add_argument('--cache', type=int, default=0, help="attribute cache size")
+	parser.add_argument('--negative', type=int, default=0, help="negative lookup cache size")
+	parser.add_argument('--paths', type=int, default=0, help="whole-path cache size")
+	parser.add_argument('--lazy', action='store_true', help="defer instantiation of nested classes")
+	parser.add_argument('--static', action='store_true', help="use static trace analysis")
+	args = parser.parse_args(argv)
+	
+	paths = []
+	
+	for log in args.logs:
+		with open(log, errors='surrogateescape') as stream:
+			paths.extend(path for path in map(extract, stream) if path is not None)
+	
+	if not paths:
+		parser.error("no paths found within the given logs")
+	
+	load(args.root)  # Fail early, within the parent, if the root can not be imported.
+	
+	options = {'cache': args.cache, 'negative': args.negative, 'paths': args.paths, 'lazy': args.lazy,
+			'static': args.static}
+	processes = max(1, min(args.processes or 1, len(paths)))
+	tasks = [(args.root, options, args.mode, args.depth, paths[i::processes]) for i in range(processes)]
+	
+	with Pool(processes) as pool:
+		outcomes = pool.map(replay, tasks)
+	
+	groups = {}
+	
+	for elapsed, partial in outcomes:
+		for group, durations in partial.items():
+			groups.setdefault(group, array('d')).extend(durations)
+	
+	throughput = sum(len(task[-1]) / elapsed for task, (elapsed, partial) in zip(tasks, outcomes))
+	every = summarize([duration for durations in groups.values() for duration in durations])
+	prefixes = {group: summarize(durations) for group, durations in groups.items()}
+	
+	print("{count:,} dispatches within {processes} processes: {rate:,.0f}/s".format(
+			count = len(paths),
+			processes = processes,
+			rate = throughput,
+		))
+	
+	line = "{name:<{width}}  {count:>10,}  p50 {p50:>10.3f} us  p95 {p95:>10.3f} us  p99 {p99:>10.3f} us"
+	ranked = sorted(prefixes.items(), key=lambda item: -item[1]['count'])[:args.top]
+	width = max(len(name) for name in list(dict(ranked)) + ['(all)'])
+	
+	for name, result in [('(all)', every)] + ranked:
+		print(line.format(name=name, width=width, count=result['count'],
+				**{key: result[key] * 1e6 for key in ('p50', 'p95', 'p99')}))
+	
+	if args.json:
+		Path(args.json).write_text(json.dumps({
+				'environment': environment(),
+				'options': dict(options, mode=args.mode, processes=processes, depth=args.depth),
+				'results': {'throughput': throughput, 'all': every, 'prefixes': prefixes},
+			}, indent='\t'))
+
+
+if __name__ == '__main__':
+	raise SystemExit(main())
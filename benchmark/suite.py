@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+"""Measure object dispatch and trace performance across representative and synthetic controller structures.
+
+Run from the project root:
+	
+	python benchmark/suite.py --json results.json
+	python benchmark/suite.py --compare results.json
+
+Results are keyed by scenario name, with the per-call duration in seconds; comparing against a previous run reports
+the relative change of each, exiting with a non-zero status if any regressed by more than the threshold.
+"""
+
+from argparse import ArgumentParser
+
+from common import measure, allocation, report, compare
+from tree import generate, paths
+
+from web.dispatch.object import ObjectDispatch
+
+from crudlike import Root, People, Person
+from sample import Simple, AnonymousDynamicAttribute, FunctionDynamicAttribute, CallableShallow, CallableDeep, \
+		CallableMixed
+
+
+DISPATCHERS = {
+		'default': ObjectDispatch(),
+		'cached': ObjectDispatch(cache=16384),
+		'negative': ObjectDispatch(cache=16384, negative=16384),
+		'paths': ObjectDispatch(cache=16384, paths=16384),
+	}
+
+MODES = {  # The ways in which dispatch may be invoked.
+		'iterate': lambda dispatch, root, path: list(dispatch(None, root, path)),
+		'resolve': lambda dispatch, root, path: dispatch.resolve(None, root, path),
+	}
+
+TRACERS = {
+		'default': DISPATCHERS['default'],
+		'static': ObjectDispatch(static=True),
+	}
+
+DISPATCH = [  # Name, root object, and path to resolve.
+		('static.shallow', Simple, '/foo'),
+		('static.deep', Simple, '/foo/bar/baz'),
+		('static.partial', Simple, '/foo/bar/diz'),
+		('static.value', Simple, '/static'),
+		('protected.underscore', Simple, '/_protected'),
+		('protected.dunder', Simple, '/__init__'),
+		('dynamic.anonymous', AnonymousDynamicAttribute, '/foo'),
+		('dynamic.annotated', FunctionDynamicAttribute, '/foo'),
+		('callable.shallow', CallableShallow, '/foo/bar/baz'),
+		('callable.deep', CallableDeep, '/foo/bar'),
+		('callable.mixed', CallableMixed, '/foo/bar/baz'),
+		('crud.collection', Root, '/user'),
+		('crud.entity', Root, '/user/GothAlice'),
+		('crud.action', Root, '/user/GothAlice/foo'),
+		('crud.missing', Root, '/wp-admin/setup.php'),
+	]
+
+TRACE = [  # Name and object to enumerate.
+		('simple', Simple),
+		('simple.instance', Simple(None)),
+		('dynamic.anonymous', AnonymousDynamicAttribute),
+		('dynamic.annotated', FunctionDynamicAttribute),
+		('crud.root', Root),
+		('crud.collection', People),
+		('crud.entity', Person),
+	]
+
+
+def scenarios(widths, depths, limit):
+	"""Generate the name and zero-argument callable of each benchmark scenario."""
+	
+	for label, dispatch in DISPATCHERS.items():
+		for mode in MODES:
+			prefix = 'dispatch.' + label if mode == 'iterate' else mode + '.' + label
+			invoke = MODES[mode]
+			
+			for name, root, path in DISPATCH:
+				yield '{}.{}'.format(prefix, name), lambda dispatch=dispatch, root=root, path=path, invoke=invoke: \
+						invoke(dispatch, root, path)
+			
+			for width in widths:
+				for depth in depths:
+					if width * depth > limit:
+						continue
+					
+					root, path = generate(width, depth, limit)
+					
+					yield '{}.tree.w{}.d{}'.format(prefix, width, depth), \
+							lambda dispatch=dispatch, root=root, path=path, invoke=invoke: invoke(dispatch, root, path)
+	
+	for label, dispatch in DISPATCHERS.items():
+		for width in widths:
+			for depth in depths:
+				if width * depth > limit:
+					continue
+				
+				root, path = generate(width, depth, limit)
+				every = list(paths(width, depth))
+				
+				yield 'batch.{}.tree.w{}.d{}'.format(label, width, depth), \
+						lambda dispatch=dispatch, root=root, every=every: dispatch.batch(None, root, every)
+				yield 'individual.{}.tree.w{}.d{}'.format(label, width, depth), \
+						lambda dispatch=dispatch, root=root, every=every: [list(dispatch(None, root, i)) for i in every]
+	
+	for label, dispatch in TRACERS.items():
+		for name, obj in TRACE:
+			yield 'trace.{}.{}'.format(label, name), lambda dispatch=dispatch, obj=obj: list(dispatch.trace(None, obj))
+		
+		for width in widths:
+			if width <= limit:
+				root, path = generate(width, 1, limit)
+				yield 'trace.{}.tree.w{}'.format(label, width), \
+						lambda dispatch=dispatch, root=root: list(dispatch.trace(None, root))
+	
+	for label, dispatch in TRACERS.items():
+		for width in widths:
+			for depth in depths:
+				if width * depth > limit:
+					continue
+				
+				root, path = generate(width, depth, limit)
+				
+				yield 'walk.{}.tree.w{}.d{}'.format(label, width, depth), \
+						lambda dispatch=dispatch, root=root: list(dispatch.walk(None, root))
+
+
+def main(argv=None):
+	parser = ArgumentParser(description=__doc__.partition('\n\n')[0])
+	parser.add_argument('--json', metavar='PATH', help="write machine-readable results to the given file")
+	parser.add_argument('--compare', metavar='PATH', help="compare against previously written results")
+	parser.add_argument('--threshold', type=float, default=0.1, help="fractional slowdown considered a regression")
+	parser.add_argument('--filter', default='', help="only run scenarios whose name contains this text")
+	parser.add_argument('--widths', default='10,100,500', help="comma-separated synthetic tree widths")
+	parser.add_argument('--depths', default='1,5,10,20', help="comma-separated synthetic tree depths")
+	parser.add_argument('--limit', type=int, default=10000, help="maximum synthetic tree node count")
+	parser.add_argument('--repeat', type=int, default=5, help="timing runs per scenario; the best is reported")
+	parser.add_argument('--quick', action='store_true', help="shorter timing runs, for smoke testing")
+	parser.add_argument('--allocations', action='store_true', help="also measure memory allocated per call")
+	args = parser.parse_args(argv)
+	
+	widths = [int(i) for i in args.widths.split(',')]
+	depths = [int(i) for i in args.depths.split(',')]
+	target = 0.01 if args.quick else 0.2
+	
+	results = {}
+	
+	for name, fn in scenarios(widths, depths, args.limit):
+		if args.filter in name:
+			results[name] = {'seconds': measure(fn, args.repeat, target)}
+			
+			if args.allocations:
+				results[name]['blocks'], results[name]['bytes'] = allocation(fn)
+	
+	report(results, args.json)
+	
+	if args.compare and compare(results, args.compare, args.threshold):
+		return 1
+
+
+if __name__ == '__main__':
+	raise SystemExit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+"""Measure the throughput of a single shared dispatcher as the number of threads using it concurrently grows.
+
+Run from the project root:
+	
+	python benchmark/threads.py --threads 1,2,4,8 --json threads.json
+
+Each result is the wall-clock time per dispatch across all threads; perfect scaling halves it as threads double. On
+builds of CPython with the global interpreter lock, expect it to remain roughly constant; on free-threaded builds, it
+should fall. Results may be compared against a previous run, as with the main suite.
+"""
+
+from argparse import ArgumentParser
+from threading import Barrier, Thread
+from time import perf_counter
+
+from common import report, compare
+from tree import generate
+
+from web.dispatch.object import ObjectDispatch
+
+from crudlike import Root
+from sample import Simple, CallableMixed
+
+
+DISPATCHERS = {
+		'default': lambda: ObjectDispatch(),
+		'cached': lambda: ObjectDispatch(cache=16384),
+	}
+
+MODES = {
+		'iterate': lambda dispatch, root, path: list(dispatch(None, root, path)),
+		'resolve': lambda dispatch, root, path: dispatch.resolve(None, root, path),
+	}
+
+WORKLOAD = [  # A mixture of static, dynamic, and failing lookups, cycled through by every thread.
+		(Simple, '/foo/bar/baz'),
+		(Simple, '/foo/bar/diz'),
+		(CallableMixed, '/foo/bar/baz'),
+		(Root, '/user/GothAlice/foo'),
+		(Root, '/wp-admin/setup.php'),
+		generate(10, 10),
+	]
+
+
+def run(threads, invoke, calls):
+	"""Time the given number of threads each performing the given number of calls, returning elapsed seconds."""
+	
+	barrier = Barrier(threads + 1)
+	
+	def worker():
+		barrier.wait()
+		
+		for i in range(calls):
+			invoke(*WORKLOAD[i % len(WORKLOAD)])
+	
+	pool = [Thread(target=worker) for i in range(threads)]
+	
+	for thread in pool:
+		thread.start()
+	
+	barrier.wait()
+	start = perf_counter()
+	
+	for thread in pool:
+		thread.join()
+	
+	return perf_counter() - start
+
+
+def main(argv=None):
+	parser = ArgumentParser(description=__doc__.partition('\n\n')[0])
+	parser.add_argument('--json', metavar='PATH', help="write machine-readable results to the given file")
+	parser.add_argument('--compare', metavar='PATH', help="compare against previously written results")
+	parser.add_argument('--threshold', type=float, default=0.1, help="fractional slowdown considered a regression")
+	parser.add_argument('--threads', default='1,2,4,8', help="comma-separated thread counts")
+	parser.add_argument('--calls', type=int, default=20000, help="dispatches performed by each thread")
+	parser.add_argument('--repeat', type=int, default=3, help="timing runs per measurement; the best is reported")
+	args = parser.parse_args(argv)
+	
+	results = {}
+	
+	for label, factory in DISPATCHERS.items():
+		for mode, invoke in MODES.items():
+			for threads in [int(i) for i in args.threads.split(',')]:
+				dispatch = factory()  # Fresh, so no measurement benefits from a cache warmed by another.
+				call = lambda root, path, dispatch=dispatch, invoke=invoke: invoke(dispatch, root, path)
+				elapsed = min(run(threads, call, args.calls) for i in range(args.repeat))
+				
+				results['threads.{}.{}.t{}'.format(label, mode, threads)] = {'seconds': elapsed / (threads * args.calls)}
+	
+	report(results, args.json)
+	
+	if args.compare and compare(results, args.compare, args.threshold):
+		return 1
+
+
+if __name__ == '__main__':
+	raise SystemExit(main())
@@ -0,0 +1,40 @@
+"""Synthetic controller trees of configurable shape, used to measure how dispatch cost scales."""
+
+
+def endpoint(self):
+	return "endpoint"
+
+
+def generate(width=10, depth=5, limit=10000):
+	"""Construct a root controller class with the given number of children at each level, nested to the given depth.
+	
+	Only the first child at each level continues the descent; its siblings are a mixture of nested classes and methods.
+	This keeps the total node count at roughly `width * depth`, which may not exceed the given limit. Returns the root
+	class and the path, as a string, to the deepest endpoint.
+	"""
+	
+	if width * depth > limit:
+		raise ValueError("A tree of width {} and depth {} would exceed {} nodes.".format(width, depth, limit))
+	
+	attributes = {'leaf': endpoint}
+	
+	for level in reversed(range(depth)):
+		for i in range(1, width):
+			attributes['m{}'.format(i) if i % 2 else 'c{}'.format(i)] = endpoint if i % 2 else \
+					type('Sibling{}x{}'.format(level, i), (), {'leaf': endpoint})
+		
+		attributes = {'n0': type('Level{}'.format(level), (), attributes)}
+	
+	return attributes['n0'], '/' + '/'.join(['n0'] * (depth - 1) + ['leaf'])
+
+
+def paths(width=10, depth=5):
+	"""Enumerate the path to every endpoint within a tree generated with the same shape."""
+	
+	for level in range(depth):
+		prefix = '/' + 'n0/' * level
+		
+		for i in range(1, width):
+			yield prefix + ('m{}'.format(i) if i % 2 else 'c{}/leaf'.format(i))
+	
+	yield prefix + 'leaf'
@@ -3,6 +3,7 @@
 """Objects used to evaluate dispatch in tests."""
 
 from collections import deque
+from inspect import isclass, isroutine
 
 
 def init(self, context=None):
@@ -13,6 +14,20 @@ def path(path):
 	return deque(path.split('/')[1:])
 
 
+def shape(crumbs):
+	"""Summarize dispatch results for comparison, identifying instances, bound methods, and closures by their origin."""
+	
+	def identify(handler):
+		handler = getattr(handler, '__func__', handler)
+		
+		if isroutine(handler):
+			return handler.__module__, handler.__qualname__
+		
+		return handler if isclass(handler) or isinstance(handler, str) else type(handler)
+	
+	return [(crumb.path, crumb.endpoint, identify(crumb.handler), crumb.options) for crumb in crumbs]
+
+
 def function(context, *args):
 	return 'function /' + '/'.join(args)
 
@@ -0,0 +1,118 @@
+"""Memory allocation budgets for dispatch of the sample controllers.
+
+Each scenario is dispatched repeatedly under `tracemalloc`, measuring, per dispatch, the blocks and bytes retained by
+its result, i.e. crumbs, controller instances, and the like, and the peak of bytes allocated transiently along the way.
+Exceeding a budget fails; should a change legitimately require more, raise the budget deliberately, within the same
+change. Budgets are calibrated against CPython 3.11 and include modest headroom; other versions and implementations
+are skipped, as their object sizes differ, as are runs measuring coverage. Run these without coverage, as continuous
+integration does within a dedicated job, using `make allocations`. Steady-state allocations are also measured by
+`benchmark/suite.py`, given the `--allocations` option.
+"""
+
+import gc
+import platform
+import sys
+import tracemalloc
+
+from statistics import median
+
+from pytest import fixture, mark, skip
+
+from web.dispatch.object import ObjectDispatch
+
+from crudlike import Root
+from sample import path, Simple, CallableShallow, CallableDeep, CallableMixed, AnonymousDynamicAttribute, \
+		FunctionDynamicAttribute
+
+
+CALIBRATED = {(3, 11)}  # The versions of CPython the budgets below reflect.
+
+BUDGETS = {  # Blocks retained, bytes retained, and peak bytes allocated, per dispatch; when iterating, then resolving.
+		(Simple, '/foo/bar/baz'): ((33, 2176, 2304), (8, 1216, 1280)),
+		(Simple, '/foo/bar/diz'): ((28, 1856, 1984), (8, 1216, 1792)),
+		(Simple, '/_protected'): ((9, 576, 1024), (8, 1216, 1792)),
+		(Simple, '/static'): ((13, 832, 1280), (4, 1088, 1088)),
+		(CallableShallow, '/'): ((8, 704, 1216), (8, 1536, 1472)),
+		(CallableDeep, '/foo/bar'): ((27, 1984, 2176), (8, 1536, 1472)),
+		(CallableMixed, '/foo/bar/baz'): ((33, 2176, 2304), (8, 1216, 1280)),
+		(AnonymousDynamicAttribute, '/foo'): ((21, 1600, 3264), (13, 1728, 2304)),
+		(FunctionDynamicAttribute, '/foo'): ((13, 896, 1280), (4, 1088, 1088)),
+		(Root, '/user/alice/foo'): ((31, 2048, 2240), (8, 1216, 1280)),
+		(Root, '/wp-admin/setup.php'): ((9, 576, 1152), (8, 1216, 1792)),
+	}
+
+DISPATCHERS = {
+		'default': ObjectDispatch(),
+		'cached': ObjectDispatch(cache=1024),
+	}
+
+
+def measure(fn, number=50):
+	"""Measure the blocks and bytes retained by the result of a single call, and the peak bytes allocated during one.
+	
+	The function is first called several times, so that only steady-state behaviour, with any caches populated, is
+	measured. Retained allocations are averaged across calls; the peak is the median observed.
+	"""
+	
+	for i in range(3):
+		fn()
+	
+	results = [None] * number
+	peaks = [0] * number
+	ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+	
+	gc.collect()
+	tracemalloc.start()
+	
+	try:
+		before = tracemalloc.take_snapshot()
+		
+		for i in range(number):
+			results[i] = fn()
+		
+		after = tracemalloc.take_snapshot()
+		
+		for i in range(number):
+			tracemalloc.reset_peak()
+			current = tracemalloc.get_traced_memory()[0]
+			fn()
+			peaks[i] = tracemalloc.get_traced_memory()[1] - current
+	
+	finally:
+		tracemalloc.stop()
+	
+	stats = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'filename')
+	
+	return sum(i.count_diff for i in stats) / number, sum(i.size_diff for i in stats) / number, median(peaks)
+
+
+@fixture(autouse=True)
+def calibrated():
+	if platform.python_implementation() != 'CPython' or sys.version_info[:2] not in CALIBRATED:
+		skip("allocation budgets are not calibrated for this version of Python")
+	
+	if sys.gettrace() is not None:
+		skip("allocations are distorted by tracing, e.g. when measuring coverage")
+
+
+@mark.parametrize('dispatcher', list(DISPATCHERS))
+@mark.parametrize('root,route', list(BUDGETS), ids=['{}:{}'.format(root.__name__, route) for root, route in BUDGETS])
+class TestBudget:
+	def check(self, fn, budget):
+		blocks, size, peak = measure(fn)
+		
+		assert blocks <= budget[0] and size <= budget[1] and peak <= budget[2], \
+				"Measured {:.1f} blocks, {:.0f} bytes retained, {:.0f} bytes peak; budget {}".format(
+						blocks, size, peak, budget)
+	
+	def test_iterate(self, dispatcher, root, route):
+		dispatch = DISPATCHERS[dispatcher]
+		elements = path(route)
+		
+		self.check(lambda: list(dispatch(None, root, elements)), BUDGETS[root, route][0])
+	
+	def test_resolve(self, dispatcher, root, route):
+		dispatch = DISPATCHERS[dispatcher]
+		elements = path(route)
+		
+		self.check(lambda: dispatch.resolve(None, root, elements), BUDGETS[root, route][1])
@@ -0,0 +1,200 @@
+from asyncio import new_event_loop, sleep
+from collections import deque
+from threading import current_thread, main_thread
+from warnings import catch_warnings, simplefilter
+
+from pytest import raises
+
+from web.dispatch.object import ObjectDispatch, AsyncObjectDispatch
+
+from crudlike import Root
+from sample import path, shape, Simple, CallableMixed
+
+
+def run(coroutine):
+	loop = new_event_loop()
+	
+	try:
+		return loop.run_until_complete(coroutine)
+	finally:
+		loop.close()
+
+
+def collect(dispatch, *args):
+	async def inner():
+		return [crumb async for crumb in dispatch(*args)]
+	
+	return run(inner())
+
+
+class Record:
+	def __init__(self, identifier):
+		self.identifier = identifier
+	
+	def view(self):
+		return self.identifier
+
+
+class Records:
+	def __init__(self, context=None):
+		pass
+	
+	async def __getattr__(self, identifier):
+		await sleep(0)
+		
+		if identifier == 'missing':
+			raise AttributeError(identifier)
+		
+		return Record(identifier)
+
+
+class People(Records):
+	def __call__(self):
+		return "all"
+
+
+class Loaded:
+	def __init__(self, context=None):
+		self.ready = False
+	
+	def __await__(self):
+		yield  # Relinquish control to the event loop once, as `sleep(0)` does.
+		self.ready = True
+		return self
+
+
+class Connection:
+	__dispatch_reuse__ = 'process'
+	constructed = 0
+	
+	def __new__(cls, context=None):
+		return cls.connect()
+	
+	@classmethod
+	async def connect(cls):
+		await sleep(0)
+		cls.constructed += 1
+		
+		instance = object.__new__(cls)
+		instance.ready = True
+		return instance
+
+
+class Blocking:
+	__dispatch_blocking__ = True
+	threads = []
+	
+	def __init__(self, context=None):
+		pass
+	
+	def __getattr__(self, name):
+		self.threads.append(current_thread())
+		return name
+
+
+dispatch = ObjectDispatch()
+asynchronous = AsyncObjectDispatch()
+
+
+class TestEquivalence:
+	def test_synchronous_controllers(self):
+		for root, target in ((Simple, '/foo/bar/baz'), (Simple, '/foo/diz'), (Simple, '/_protected'),
+				(CallableMixed, '/foo/bar'), (Root, '/user/GothAlice/foo')):
+			assert shape(collect(asynchronous, None, root, path(target))) == shape(dispatch(None, root, path(target)))
+			
+			result = run(asynchronous.resolve(None, root, path(target)))
+			expect = dispatch.resolve(None, root, path(target))
+			
+			assert (result.endpoint, result.options, result.path, result.remaining) == \
+					(expect.endpoint, expect.options, expect.path, expect.remaining)
+	
+	def test_path_forms(self):
+		for target in (b'/foo/bar/diz/', ['foo', 'bar', 'diz', ''], '/foo/bar/diz/'):
+			assert shape(collect(asynchronous, None, Simple, target)) == shape(dispatch(None, Simple, target))
+			assert run(asynchronous.resolve(None, Simple, target)).remaining == deque(['diz'])
+
+
+class TestAwaitable:
+	def test_awaitable_getattr(self):
+		result = collect(asynchronous, None, Records, path('/27/view'))
+		
+		assert len(result) == 4
+		assert isinstance(result[2].handler, Record)
+		assert result[2].handler.identifier == '27'
+		assert result[-1].endpoint
+		assert result[-1].handler() == '27'
+	
+	def test_awaitable_miss(self):
+		result = run(asynchronous.resolve(None, Records, path('/missing')))
+		
+		assert isinstance(result.handler, Records)
+		assert list(result.remaining) == ['missing']
+	
+	def test_callable_collection(self):
+		with catch_warnings():
+			simplefilter('error')  # Any un-awaited coroutine, such as one produced by __getattr__, would be reported.
+			result = run(asynchronous.resolve(None, People, path('/')))
+			crumbs = collect(asynchronous, None, People, path('/'))
+		
+		assert isinstance(result.handler, People)
+		assert result.endpoint
+		assert crumbs[-1].endpoint
+		assert run(asynchronous.resolve(None, People, path('/27'))).handler.identifier == '27'
+	
+	def test_awaitable_instantiation(self):
+		result = run(asynchronous.resolve(None, Loaded, path('/')))
+		
+		assert isinstance(result.handler, Loaded)
+		assert result.handler.ready
+
+
+class TestUnsupported:
+	def test_batch(self):
+		with raises(TypeError):
+			asynchronous.batch(None, Records, ['/27/view'])
+
+
+class TestReuse:
+	def test_awaited_once(self):
+		pool = AsyncObjectDispatch()
+		Connection.constructed = 0
+		
+		first = run(pool.resolve(None, Connection, path('/'))).handler
+		second = run(pool.resolve(None, Connection, path('/'))).handler
+		
+		assert first is second and first.ready
+		assert Connection.constructed == 1
+	
+	def test_concurrent(self):
+		from asyncio import gather
+		
+		pool = AsyncObjectDispatch()
+		Connection.constructed = 0
+		
+		async def concurrently():
+			return await gather(*(pool.resolve(None, Connection, path('/')) for i in range(3)))
+		
+		results = run(concurrently())
+		
+		assert len({id(result.handler) for result in results}) == 1
+		assert Connection.constructed == 1
+
+
+class TestBlocking:
+	def test_offloaded(self):
+		pool = AsyncObjectDispatch(workers=2)
+		del Blocking.threads[:]
+		
+		try:
+			result = run(pool.resolve(None, Blocking, path('/foo')))
+		finally:
+			pool.close()
+		
+		assert result.handler == 'foo'
+		assert list(result.remaining) == []
+		assert Blocking.threads and main_thread() not in Blocking.threads
+	
+	def test_inline_without_workers(self):
+		del Blocking.threads[:]
+		collect(asynchronous, None, Blocking, path('/foo'))
+		assert Blocking.threads == [main_thread()]
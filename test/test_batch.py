@@ -0,0 +1,82 @@
+from web.dispatch.object import ObjectDispatch
+from web.dispatch.object.batch import segments, trie
+
+from crudlike import Root
+from sample import shape, Simple, CallableMixed, function
+
+
+dispatch = ObjectDispatch()
+
+PATHS = [
+		'/',
+		'',
+		'/foo',
+		'/foo/',
+		'/foo/bar',
+		'/foo/bar/baz',
+		'/foo/bar/diz',
+		'/foo/diz/baz',
+		'/_protected',
+		'/static',
+		'/static/foo',
+		'/missing',
+	]
+
+
+class Counted:
+	instances = 0
+	
+	def __init__(self, context=None):
+		Counted.instances += 1
+	
+	class child:
+		def __init__(self, context=None):
+			Counted.instances += 1
+		
+		def first(self):
+			pass
+		
+		def second(self):
+			pass
+
+
+class TestTrie:
+	def test_segments(self):
+		assert segments('/foo/bar/') == ('foo', 'bar')
+		assert segments(['foo', 'bar']) == ('foo', 'bar')
+		assert segments('/') == ()
+	
+	def test_shared_prefix(self):
+		root = trie([('a', 'b'), ('a', 'c'), ('a', ), ()])
+		
+		assert root[1] == [3]
+		assert set(root[0]) == {'a'}
+		assert root[0]['a'][1] == [2]
+		assert set(root[0]['a'][0]) == {'b', 'c'}
+
+
+class TestBatch:
+	def test_equivalence(self):
+		for root, paths in ((Simple, PATHS), (CallableMixed, PATHS), (function, PATHS),
+				(Root, ['/user', '/user/GothAlice', '/user/GothAlice/foo', '/user/amcgregor/foo', '/wp-admin'])):
+			results = dispatch.batch(None, root, paths)
+			
+			assert len(results) == len(paths)
+			
+			for path, result in zip(paths, results):
+				assert shape(result) == shape(dispatch(None, root, path)), path
+	
+	def test_shared_instantiation(self):
+		Counted.instances = 0
+		results = dispatch.batch(None, Counted, ['/child/first', '/child/second', '/child/first'])
+		
+		assert Counted.instances == 2
+		assert results[0][-1].handler.__self__ is results[1][-1].handler.__self__
+	
+	def test_events(self):
+		seen = []
+		local = ObjectDispatch(listeners=[lambda dispatcher, event, context, **data: seen.append(event)])
+		local.batch(None, Simple, ['/foo/bar/baz', '/foo/bar/diz'])
+		
+		assert seen.count('instantiate') == 3
+		assert seen.count('terminus') == 2
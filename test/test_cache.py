@@ -0,0 +1,129 @@
+from web.dispatch.core import nodefault
+from web.dispatch.object import ObjectDispatch
+from web.dispatch.object.cache import PROTECTED, MISSING, CLASS, ATTRIBUTE, DYNAMIC, LRUCache, AttributeCache
+
+from crudlike import Root
+from sample import path, shape, Simple, CallableDeep, CallableMixed, AnonymousDynamicAttribute
+
+
+dispatch = ObjectDispatch()
+cached = ObjectDispatch(cache=64)
+
+
+class TestLRUCache:
+	def test_bounded(self):
+		cache = LRUCache(2)
+		cache.set('a', 1)
+		cache.set('b', 2)
+		assert cache.get('a') == 1  # Promotes "a" over "b".
+		cache.set('c', 3)
+		
+		assert len(cache) == 2
+		assert 'b' not in cache
+		assert cache.get('b') is None
+		assert cache.stats == {'size': 2, 'capacity': 2, 'hits': 1, 'misses': 1, 'evictions': 1}
+	
+	def test_expiry(self):
+		cache = LRUCache(ttl=60)
+		cache.set('a', 1)
+		assert cache.get('a') == 1
+		
+		cache.ttl = -1  # Everything stored from now on is already stale.
+		cache.set('b', 2)
+		assert cache.get('b') is None
+		assert 'b' not in cache
+	
+	def test_invalidate(self):
+		cache = LRUCache()
+		cache.set(1, 1)
+		cache.set(2, 2)
+		
+		cache.invalidate(lambda key: key == 1)
+		assert 1 not in cache and 2 in cache
+		
+		cache.invalidate()
+		assert not len(cache)
+
+
+class TestClassification:
+	def test_kinds(self):
+		cache = AttributeCache()
+		
+		assert cache.classify(Simple, '_protected') == (PROTECTED, None)
+		assert cache.classify(Simple, 'foo') == (CLASS, Simple.foo)
+		assert cache.classify(Simple, 'static') == (ATTRIBUTE, None)
+		assert cache.classify(Simple, 'missing') == (MISSING, None)
+		assert cache.classify(AnonymousDynamicAttribute, 'missing') == (DYNAMIC, None)
+	
+	def test_unprotected(self):
+		assert AttributeCache(protect=False).classify(Simple, '_protected') == (ATTRIBUTE, None)
+
+
+class TestCachedDispatch:
+	def test_equivalence(self):
+		for root, target in (
+					(Simple, '/foo/bar/baz'),
+					(Simple, '/foo/bar/diz'),
+					(Simple, '/_protected'),
+					(CallableDeep, '/foo/bar/baz'),
+					(CallableMixed, '/foo/diz'),
+					(Root, '/user/GothAlice/foo'),
+				):
+			expect = shape(dispatch(None, root, path(target)))
+			
+			for i in range(3):  # Repeated to exercise population, then use, of the cache.
+				assert shape(cached(None, root, path(target))) == expect
+	
+	def test_hits(self):
+		local = ObjectDispatch(cache=64)
+		list(local(None, Simple, path('/foo/bar/baz')))
+		assert local.cache.hits == 0
+		
+		list(local(None, Simple, path('/foo/bar/baz')))
+		assert local.cache.hits == 3
+	
+	def test_mutation(self):
+		class Mutable:
+			class child:
+				pass
+		
+		local = ObjectDispatch(cache=64)
+		assert isinstance(list(local(None, Mutable, path('/child')))[-1].handler, Mutable.child)
+		
+		class replacement:
+			pass
+		
+		Mutable.child = replacement
+		assert isinstance(list(local(None, Mutable, path('/child')))[-1].handler, replacement)
+		
+		del Mutable.child
+		assert isinstance(list(local(None, Mutable, path('/child')))[-1].handler, Mutable)
+		
+		Mutable.child = replacement
+		assert isinstance(list(local(None, Mutable, path('/child')))[-1].handler, replacement)
+	
+	def test_instance_attribute(self):
+		class Container:
+			class child:
+				pass
+		
+		inst = Container()
+		inst.child = 'instance'
+		inst.other = 'other'
+		
+		assert cached.cache.lookup(inst, 'child') == (ATTRIBUTE, 'instance')
+		assert cached.cache.lookup(inst, 'other') == (ATTRIBUTE, 'other')
+		assert cached.cache.lookup(Container(), 'child') == (CLASS, Container.child)
+		assert cached.cache.lookup(Container(), 'other') == (MISSING, nodefault)
+	
+	def test_dynamic_uncached(self):
+		calls = []
+		
+		class Dynamic:
+			def __getattr__(self, name):
+				calls.append(name)
+				return name
+		
+		list(cached(None, Dynamic, path('/foo')))
+		list(cached(None, Dynamic, path('/foo')))
+		assert calls == ['foo', 'foo']
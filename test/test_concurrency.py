@@ -0,0 +1,142 @@
+import sys
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from pytest import fixture
+
+from web.dispatch.object import ObjectDispatch, memoize
+from web.dispatch.object.cache import LRUCache
+
+from crudlike import Root
+from sample import path, shape, Simple, CallableMixed
+
+
+THREADS = 8
+ROUTES = [
+		(Simple, '/foo/bar/baz'),
+		(Simple, '/foo/bar/diz'),
+		(Simple, '/_protected'),
+		(Simple, '/static'),
+		(CallableMixed, '/foo/bar/baz'),
+		(CallableMixed, '/'),
+		(Root, '/user/alice/foo'),
+		(Root, '/wp-admin/setup.php'),
+	]
+
+
+@fixture(autouse=True)
+def interleave():
+	"""Switch between threads as often as possible, to maximize the opportunity for interference."""
+	
+	interval = sys.getswitchinterval()
+	sys.setswitchinterval(1e-6)
+	yield
+	sys.setswitchinterval(interval)
+
+
+def hammer(fn, iterations=200):
+	"""Call the given function concurrently from many threads at once, returning the results of every call."""
+	
+	barrier = Barrier(THREADS)
+	
+	def worker(index):
+		barrier.wait()
+		return [fn(index, i) for i in range(iterations)]
+	
+	with ThreadPoolExecutor(THREADS) as executor:
+		return [result for results in executor.map(worker, range(THREADS)) for result in results]
+
+
+class TestSharedDispatcher:
+	def check(self, dispatch):
+		expected = [shape(ObjectDispatch()(None, root, path(route))) for root, route in ROUTES]
+		
+		def attempt(thread, i):
+			root, route = ROUTES[(thread + i) % len(ROUTES)]
+			return (thread + i) % len(ROUTES), shape(dispatch(None, root, path(route)))
+		
+		for index, result in hammer(attempt):
+			assert result == expected[index]
+	
+	def test_uncached(self):
+		self.check(ObjectDispatch())
+	
+	def test_cached(self):
+		self.check(ObjectDispatch(cache=1024))
+	
+	def test_cached_under_eviction(self):
+		dispatch = ObjectDispatch(cache=2)  # Far smaller than the working set; entries are constantly evicted.
+		self.check(dispatch)
+		
+		assert len(dispatch.cache) <= 2
+		assert dispatch.cache.evictions > 0
+	
+	def test_static_trace(self):
+		dispatch = ObjectDispatch(static=True)
+		expected = list(dispatch.trace(None, Simple))
+		
+		for result in hammer(lambda thread, i: list(dispatch.trace(None, Simple)), 50):
+			assert [shape([crumb]) for crumb in result] == [shape([crumb]) for crumb in expected]
+	
+	def test_listener_attachment(self):
+		dispatch = ObjectDispatch(cache=64)
+		seen = []
+		
+		def listener(dispatcher, event, context, **data):
+			seen.append(event)
+		
+		def attempt(thread, i):
+			if thread == 0:  # One thread repeatedly attaches and detaches while the others dispatch.
+				dispatch.listen(listener) if i % 2 else dispatch.forget(listener)
+			
+			return shape(dispatch(None, Simple, path('/foo/bar/baz')))
+		
+		results = hammer(attempt)
+		
+		assert all(result == results[0] for result in results)
+		assert seen
+	
+	def test_process_reuse(self):
+		class Shared:
+			__dispatch_reuse__ = 'process'
+			
+			def endpoint(self):
+				return "shared"
+		
+		dispatch = ObjectDispatch()
+		handlers = hammer(lambda thread, i: list(dispatch(None, Shared, path('/endpoint')))[-1].handler.__self__)
+		
+		assert all(handler is handlers[0] for handler in handlers)
+
+
+class TestCaches:
+	def test_bounded(self):
+		cache = LRUCache(16)
+		
+		def attempt(thread, i):
+			key = (thread * i) % 64
+			value = cache.get(key)
+			
+			if value is None:
+				value = cache.set(key, key * 2)
+			
+			return key, value
+		
+		for key, value in hammer(attempt, 500):
+			assert value == key * 2
+		
+		assert len(cache) <= 16
+	
+	def test_memoize(self):
+		class Dynamic:
+			@memoize(size=8)
+			def __getattr__(self, name):
+				return name.upper()
+		
+		instance = Dynamic()
+		
+		for thread, value in hammer(lambda thread, i: (thread, getattr(instance, 'n' + str(i % 32)))):
+			assert value.startswith('N')
+		
+		assert len(Dynamic.__getattr__.cache) <= 8
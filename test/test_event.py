@@ -0,0 +1,73 @@
+import logging
+
+from pytest import raises
+
+from web.dispatch.object import ObjectDispatch
+from web.dispatch.object.event import log
+
+from sample import path, Simple
+
+
+class Recorder:
+	def __init__(self):
+		self.events = []
+	
+	def __call__(self, dispatcher, event, context, **data):
+		self.events.append((event, data.get('segment')))
+
+
+class TestListeners:
+	def test_unobserved(self):
+		assert ObjectDispatch().hooks is None
+	
+	def test_descent(self):
+		recorder = Recorder()
+		dispatch = ObjectDispatch(listeners=[recorder])
+		list(dispatch(None, Simple, path('/foo/bar/baz')))
+		
+		assert recorder.events == [
+				('instantiate', None),
+				('descend', 'foo'),
+				('instantiate', None),
+				('descend', 'bar'),
+				('instantiate', None),
+				('descend', 'baz'),
+				('terminus', None),
+			]
+	
+	def test_protected(self):
+		recorder = Recorder()
+		dispatch = ObjectDispatch()
+		dispatch.listen(recorder, 'protected', 'terminus')
+		list(dispatch(None, Simple, path('/_protected')))
+		
+		assert recorder.events == [('protected', '_protected'), ('terminus', '_protected')]
+	
+	def test_miss(self):
+		recorder = Recorder()
+		dispatch = ObjectDispatch(cache=16)
+		dispatch.listen(recorder, 'miss')
+		list(dispatch(None, Simple, path('/foo/diz')))
+		
+		assert recorder.events == [('miss', 'diz')]
+	
+	def test_forget(self):
+		recorder = Recorder()
+		dispatch = ObjectDispatch(listeners=[recorder])
+		dispatch.forget(recorder)
+		list(dispatch(None, Simple, path('/foo')))
+		
+		assert dispatch.hooks is None
+		assert not recorder.events
+	
+	def test_unknown_event(self):
+		with raises(ValueError):
+			ObjectDispatch().listen(Recorder(), 'unknown')
+	
+	def test_log(self, caplog):
+		dispatch = ObjectDispatch(listeners=[log])
+		
+		with caplog.at_level(logging.DEBUG, logger='web.dispatch.object'):
+			list(dispatch(None, Simple, path('/foo')))
+		
+		assert [record.getMessage() for record in caplog.records][-1] == "Object dispatch event: terminus"
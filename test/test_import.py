@@ -0,0 +1,91 @@
+"""Import-time budget for the package, as required by short-lived processes.
+
+Each check runs within a fresh interpreter. Time is measured using `-X importtime`, with bytecode caching enabled,
+taking the fastest of several imports; the `web.dispatch.core` dependency, imported first, is not counted against the
+budget. Should a change legitimately require more, raise the budget deliberately, within the same change.
+"""
+
+import os
+import platform
+import subprocess
+import sys
+
+from pathlib import Path
+
+from pytest import mark
+
+from web.dispatch import object as package
+
+
+BUDGET = 0.025  # Seconds, excluding `web.dispatch.core`.
+
+DEFERRED = ('asyncio', 'concurrent.futures', 'json', 'logging')  # Modules not imported until used.
+
+ROOT = str(Path(__file__).parent.parent)
+
+deferrable = mark.skipif(sys.version_info < (3, 7), reason="module __getattr__, and thus deferral, requires Python 3.7")
+
+
+def run(code, *options, bytecode=False):
+	env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, str(Path(__file__).parent)]))
+	
+	if bytecode:
+		env.pop('PYTHONDONTWRITEBYTECODE', None)
+	
+	result = subprocess.run([sys.executable, *options, '-c', code], env=env, stdout=subprocess.PIPE,
+			stderr=subprocess.PIPE, universal_newlines=True, check=True)
+	
+	return result.stdout, result.stderr
+
+
+def cumulative(report, module):
+	"""Extract the cumulative import time, in seconds, of the given module from an `-X importtime` report."""
+	
+	for line in report.splitlines():
+		parts = [part.strip() for part in line.split('|')]
+		
+		if len(parts) == 3 and parts[2] == module:
+			return int(parts[1]) / 1e6
+	
+	raise LookupError(module)
+
+
+class TestImport:
+	@mark.skipif(platform.python_implementation() != 'CPython' or sys.version_info < (3, 7),
+			reason="-X importtime requires CPython 3.7")
+	def test_budget(self):
+		run("import web.dispatch.object", bytecode=True)  # Populate the bytecode cache.
+		measured = []
+		
+		for i in range(5):
+			report = run("import web.dispatch.object", '-X', 'importtime', bytecode=True)[1]
+			measured.append(cumulative(report, 'web.dispatch.object') - cumulative(report, 'web.dispatch.core'))
+		
+		assert min(measured) <= BUDGET, "Import took {:.1f} ms; budget {:.1f} ms".format(
+				min(measured) * 1e3, BUDGET * 1e3)
+	
+	@deferrable
+	def test_deferred(self):
+		loaded = run("import sys, web.dispatch.object; print(' '.join(sys.modules))")[0].split()
+		
+		assert not set(DEFERRED) & set(loaded)
+	
+	@deferrable
+	def test_dispatch_without_inspect(self):
+		output = run("import sys, web.dispatch.core, sample; sys.modules['inspect'] = None\n"
+				"from web.dispatch.object import ObjectDispatch; from sample import Simple\n"
+				"print(ObjectDispatch().resolve(None, Simple, '/foo/bar/baz').endpoint,"
+				" list(ObjectDispatch(cache=10)(None, Simple, '/foo/bar/baz'))[-1].endpoint)")[0]
+		
+		assert output.split() == ['True', 'True']
+	
+	def test_lazy(self):
+		assert package.ReverseIndex.__module__ == 'web.dispatch.object.reverse'
+		assert 'AsyncObjectDispatch' in dir(package)
+		
+		try:
+			package.Missing
+		except AttributeError:
+			pass
+		else:
+			assert False, "Expected AttributeError."
@@ -0,0 +1,72 @@
+from web.dispatch.object import ObjectDispatch
+from web.dispatch.object.introspect import describe, invalidate
+
+from crudlike import Root, People, Person
+from sample import shape, Simple, AnonymousDynamicAttribute, FunctionDynamicAttribute, ClassDynamicAttribute, \
+		CallableShallow, CallableMixed
+
+
+dispatch = ObjectDispatch()
+static = ObjectDispatch(static=True)
+
+
+class Expensive:
+	calls = 0
+	
+	def __init__(self, context=None):
+		self.loaded = True
+	
+	@property
+	def records(self):
+		Expensive.calls += 1
+		return []
+	
+	def action(self, name, value):
+		pass
+
+
+class TestStaticTrace:
+	def test_equivalence(self):
+		for obj in (Root, People, Person, Simple, AnonymousDynamicAttribute, FunctionDynamicAttribute,
+				ClassDynamicAttribute, CallableShallow, CallableMixed, Root(), People(), Person('GothAlice'),
+				Simple(None), CallableMixed(None)):
+			for i in range(2):  # Both populating, and then utilizing the cache.
+				assert shape(static.trace(None, obj)) == shape(dispatch.trace(None, obj))
+	
+	def test_bound_handlers(self):
+		inst = Person('GothAlice')
+		result = list(static.trace(None, inst))
+		
+		assert result[0].handler is inst
+		assert result[1].handler == inst.foo
+		assert result[1].handler() == "I'm also GothAlice"
+	
+	def test_descriptors_not_evaluated(self):
+		Expensive.calls = 0
+		inst = Expensive()
+		
+		list(dispatch.trace(None, inst))
+		assert Expensive.calls == 1
+		
+		result = {str(crumb.path): crumb for crumb in static.trace(None, inst)}
+		assert Expensive.calls == 1
+		
+		assert isinstance(result['records'].handler, property)
+		assert not result['records'].endpoint
+		assert result['action'].options == {'GET', 'POST'}
+		assert result['loaded'].handler is True
+	
+	def test_cached(self):
+		assert describe(Person) is describe(Person)
+	
+	def test_invalidate(self):
+		class Mutable:
+			def first(self):
+				pass
+		
+		assert [str(i.path) for i in static.trace(None, Mutable)] == ['first']
+		
+		Mutable.second = Mutable.first
+		invalidate(Mutable)
+		
+		assert [str(i.path) for i in static.trace(None, Mutable)] == ['first', 'second']
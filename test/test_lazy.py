@@ -0,0 +1,94 @@
+from asyncio import new_event_loop
+
+from pytest import mark
+
+from web.dispatch.object import ObjectDispatch, AsyncObjectDispatch, Policy
+
+from crudlike import Root
+from sample import path, shape, Simple, CallableDeep, CallableMixed
+
+
+ROUTES = [
+		(Simple, '/'),
+		(Simple, '/foo/bar/baz'),
+		(Simple, '/foo/bar/diz'),
+		(Simple, '/foo/_protected'),
+		(Simple, '/static'),
+		(CallableDeep, '/foo/bar'),
+		(CallableMixed, '/foo/bar/baz'),
+		(Root, '/user/GothAlice/foo'),
+		(Root, '/wp-admin'),
+	]
+
+eager = ObjectDispatch()
+
+
+def steps(crumbs):
+	"""The path consumed by each step, and the final outcome, omitting instantiation and the identity of handlers."""
+	
+	return [crumb.path for crumb in crumbs if crumb.path is not None] + shape(crumbs[-1:])
+
+
+def outcome(result):
+	return result.endpoint, result.options, result.path, list(result.remaining), shape([result])[0][2]
+
+
+class Recorder:
+	def __init__(self):
+		self.instantiated = []
+	
+	def __call__(self, dispatcher, event, context, handler=None, **data):
+		if event == 'instantiate':
+			self.instantiated.append(type(handler))
+
+
+class TestLazy:
+	@mark.parametrize('cache', [0, 64])
+	def test_equivalent(self, cache):
+		lazy = ObjectDispatch(lazy=True, cache=cache)
+		
+		for root, route in ROUTES:
+			assert steps(list(lazy(None, root, path(route)))) == steps(list(eager(None, root, path(route))))
+			assert outcome(lazy.resolve(None, root, path(route))) == outcome(eager.resolve(None, root, path(route)))
+	
+	@mark.parametrize('cache', [0, 64])
+	def test_instantiates_only_terminus(self, cache):
+		recorder = Recorder()
+		lazy = ObjectDispatch(lazy=True, cache=cache, listeners=[recorder])
+		crumbs = list(lazy(None, Simple, path('/foo/bar/baz')))
+		
+		assert recorder.instantiated == [Simple.foo.bar]  # Only where an instance attribute was needed.
+		assert [crumb.handler for crumb in crumbs[:2]] == [Simple, Simple.foo]
+		assert crumbs[-1].handler() == "baz"
+	
+	def test_instantiates_for_dynamic_lookup(self):
+		recorder = Recorder()
+		ObjectDispatch(lazy=True, listeners=[recorder]).resolve(None, Root, path('/user/GothAlice'))
+		
+		assert [cls.__name__ for cls in recorder.instantiated] == ['People']  # Person is constructed by __getattr__ itself.
+	
+	def test_protection(self):
+		for lazy in (ObjectDispatch(lazy=True), ObjectDispatch(lazy=True, cache=64)):
+			assert list(lazy.resolve(None, Simple, path('/foo/_bar')).remaining) == ['_bar']
+		
+		for lazy in (ObjectDispatch(lazy=True, policy=Policy(deny=['bar'])),
+				ObjectDispatch(lazy=True, cache=64, policy=Policy(deny=['bar']))):
+			assert list(lazy.resolve(None, Simple, path('/foo/bar/baz')).remaining) == ['bar', 'baz']
+	
+	def test_asynchronous(self):
+		lazy = AsyncObjectDispatch(lazy=True)
+		loop = new_event_loop()
+		
+		async def collect(root, route):
+			return [crumb async for crumb in lazy(None, root, path(route))]
+		
+		try:
+			for root, route in ROUTES:
+				crumbs = loop.run_until_complete(collect(root, route))
+				result = loop.run_until_complete(lazy.resolve(None, root, path(route)))
+				
+				assert steps(crumbs) == steps(list(eager(None, root, path(route))))
+				assert outcome(result) == outcome(eager.resolve(None, root, path(route)))
+		
+		finally:
+			loop.close()
@@ -0,0 +1,94 @@
+from asyncio import new_event_loop
+
+from web.dispatch.object import ObjectDispatch, AsyncObjectDispatch, memoize
+
+from crudlike import Person
+from sample import path
+
+
+dispatch = ObjectDispatch()
+
+
+class Directory:
+	loads = []
+	
+	def __init__(self, context=None):
+		self._ctx = context
+	
+	@memoize(size=2)
+	def __getattr__(self, username) -> Person:
+		if username.startswith('_'):
+			raise AttributeError(username)
+		
+		self.loads.append(username)
+		return Person(username)
+
+
+class Tenanted:
+	def __init__(self, context=None):
+		self._ctx = context
+	
+	@memoize(key=lambda self, name: (self._ctx, name), ttl=60)
+	def __getattr__(self, name):
+		return (self._ctx, name)
+
+
+class Remote:
+	loads = 0
+	
+	@memoize()
+	async def __getattr__(self, name):
+		Remote.loads += 1
+		return name
+
+
+class TestMemoize:
+	def setup_method(self, method):
+		del Directory.loads[:]
+		Directory.__getattr__.invalidate()
+	
+	def test_remembered(self):
+		first = dispatch.resolve(None, Directory, path('/alice'))
+		second = dispatch.resolve(None, Directory, path('/alice'))
+		
+		assert first.handler is second.handler
+		assert Directory.loads == ['alice']
+		assert Directory.__getattr__.cache.hits == 1
+	
+	def test_bounded(self):
+		for name in ('alice', 'bob', 'carol', 'alice'):
+			dispatch.resolve(None, Directory, path('/' + name))
+		
+		assert Directory.loads == ['alice', 'bob', 'carol', 'alice']
+		assert len(Directory.__getattr__.cache) == 2
+	
+	def test_invalidate(self):
+		dispatch.resolve(None, Directory, path('/alice'))
+		Directory.__getattr__.invalidate('alice')
+		dispatch.resolve(None, Directory, path('/alice'))
+		
+		assert Directory.loads == ['alice', 'alice']
+	
+	def test_failures_not_remembered(self):
+		assert not dispatch.resolve(None, Directory, path('/_private')).endpoint
+		assert not len(Directory.__getattr__.cache)
+	
+	def test_key(self):
+		assert dispatch.resolve('a', Tenanted, path('/x')).handler == ('a', 'x')
+		assert dispatch.resolve('b', Tenanted, path('/x')).handler == ('b', 'x')
+	
+	def test_trace_annotation(self):
+		result = {str(crumb.path): crumb.handler for crumb in dispatch.trace(None, Directory)}
+		assert result['{username}'] is Person
+	
+	def test_coroutine(self):
+		loop = new_event_loop()
+		asynchronous = AsyncObjectDispatch()
+		
+		try:
+			assert loop.run_until_complete(asynchronous.resolve(None, Remote, path('/x'))).handler == 'x'
+			assert loop.run_until_complete(asynchronous.resolve(None, Remote, path('/x'))).handler == 'x'
+		finally:
+			loop.close()
+		
+		assert Remote.loads == 1
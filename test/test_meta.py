@@ -0,0 +1,116 @@
+import gc
+
+from functools import partial
+from operator import add
+
+from web.dispatch.object import ObjectDispatch
+from web.dispatch.object.meta import Metadata, metadata, analyse, invalidate, _objects, _bound, _instances
+
+from crudlike import Root
+from sample import path, Simple
+
+
+class Controller:
+	def __init__(self, context=None):
+		pass
+	
+	def __call__(self, name):
+		return name
+	
+	def index(self):
+		return "index"
+	
+	def submit(self, name, value):
+		return value
+
+
+class Marked:
+	__dispatch__ = 'object'
+	
+	def __call__(self):
+		pass
+
+
+class Unmarked:
+	__dispatch__ = None
+	
+	def __call__(self):
+		pass
+
+
+class TestMetadata:
+	def test_equivalent(self):
+		for obj in (Controller, Controller(), Controller().index, Controller().submit, Marked(), Unmarked(), "text",
+				Controller.submit, len):
+			assert metadata(obj) == analyse(obj)
+	
+	def test_analysis(self):
+		assert metadata(Controller().submit) == Metadata(True, True, frozenset({'GET', 'POST'}))
+		assert metadata(Controller().index) == Metadata(True, True, None)
+		assert metadata(Marked()) == Metadata(False, False, None)
+		assert metadata(Unmarked()) == Metadata(False, True, None)
+		assert metadata("text") == Metadata(False, False, None)
+	
+	def test_shared(self):
+		first = metadata(Controller().submit)
+		
+		assert metadata(Controller().submit) is first  # Regardless of the instance bound to.
+		assert Controller.submit in _bound
+		assert metadata(Controller()) is metadata(Controller())
+		assert Controller in _instances
+		assert metadata("foo") is metadata("bar")  # Built-in types included.
+	
+	def test_distinct_callables(self):
+		assert metadata(add).options == analyse(add).options
+		assert metadata(len).options == analyse(len).options  # Not that of add, seen first.
+		assert metadata(partial(Controller().submit)).options == frozenset({'GET', 'POST'})
+		assert metadata(partial(Controller().index)).options is None
+		assert type(add) not in _instances and partial not in _instances
+	
+	def test_instance_override(self):
+		instance = Controller()
+		instance.__options__ = {'PUT'}
+		
+		assert metadata(instance).options == frozenset({'PUT'})
+		assert metadata(Controller()).options != frozenset({'PUT'})
+	
+	def test_invalidate(self):
+		def endpoint(value):
+			return value
+		
+		assert metadata(endpoint).options is None
+		
+		endpoint.__options__ = {'GET'}
+		assert metadata(endpoint).options is None  # Stale, until invalidated.
+		
+		invalidate(endpoint)
+		assert metadata(endpoint).options == frozenset({'GET'})
+	
+	def test_collected(self):
+		class Transient:
+			def __call__(self):
+				pass
+		
+		metadata(Transient)
+		metadata(Transient())
+		count = len(_objects), len(_instances)
+		
+		del Transient
+		gc.collect()
+		
+		assert (len(_objects), len(_instances)) == (count[0] - 1, count[1] - 1)
+
+
+class TestDispatch:
+	def test_interrupted_options(self):
+		result = ObjectDispatch().resolve(None, Root, path('/user/alice/foo/bar'))
+		crumb = list(ObjectDispatch()(None, Root, path('/user/alice/foo/bar')))[-1]
+		
+		assert result.options is crumb.options is metadata(result.handler).options
+	
+	def test_warm(self):
+		invalidate()
+		ObjectDispatch().warm(Simple, freeze=False)
+		
+		assert Simple.foo.bar.baz in _bound
+		assert Simple.foo in _objects
@@ -0,0 +1,176 @@
+from asyncio import new_event_loop
+
+from web.dispatch.object import ObjectDispatch, AsyncObjectDispatch
+from web.dispatch.object.cache import NegativeCache
+
+from crudlike import Root
+from sample import path, shape, Simple
+
+
+class Counting:
+	calls = 0
+	
+	def __getattr__(self, name):
+		type(self).calls += 1
+		raise AttributeError(name)
+
+
+class Remembered(Counting):
+	__dispatch_negative__ = True
+
+
+class AsyncRemembered:
+	__dispatch_negative__ = True
+	calls = 0
+	
+	async def __getattr__(self, name):
+		AsyncRemembered.calls += 1
+		raise AttributeError(name)
+
+
+class Conditional:
+	def __init__(self, context=None):
+		if context:
+			self.extra = "extra"
+
+
+class Failing:
+	@property
+	def broken(self):
+		raise AttributeError("broken")
+
+
+class TestStaticMisses:
+	def test_remembered(self):
+		dispatch = ObjectDispatch(negative=16)
+		expected = shape(ObjectDispatch()(None, Root, path('/wp-admin/setup.php')))
+		
+		assert shape(dispatch(None, Root, path('/wp-admin/setup.php'))) == expected
+		assert (Root, 'wp-admin') in dispatch.negative
+		assert dispatch.negative.hits == 0
+		
+		assert shape(dispatch(None, Root, path('/wp-admin/setup.php'))) == expected
+		assert dispatch.negative.hits == 1
+	
+	def test_with_attribute_cache(self):
+		dispatch = ObjectDispatch(cache=16, negative=16)
+		
+		for i in range(3):
+			assert list(dispatch.resolve(None, Simple, path('/foo/bar/diz')).remaining) == ['diz']
+		
+		assert dispatch.negative.stats['hits'] == 2
+	
+	def test_flood_does_not_evict(self):
+		dispatch = ObjectDispatch(cache=8, negative=1024)
+		dispatch.resolve(None, Simple, path('/foo/bar/baz'))
+		
+		for i in range(100):
+			dispatch.resolve(None, Simple, path('/probe{}'.format(i)))
+		
+		assert dispatch.cache.evictions == 0  # Misses are recorded by the negative cache alone.
+		assert len(dispatch.negative) == 100
+		
+		hits = dispatch.cache.hits
+		dispatch.resolve(None, Simple, path('/foo/bar/baz'))
+		assert dispatch.cache.hits == hits + 3
+	
+	def test_given_instance(self):
+		negative = NegativeCache(16)  # Empty, and therefore falsy, but no less a cache to use.
+		dispatch = ObjectDispatch(negative=negative)
+		
+		assert dispatch.negative is negative
+		dispatch.resolve(None, Root, path('/wp-admin'))
+		assert (Root, 'wp-admin') in negative
+	
+	def test_stats(self):
+		dispatch = ObjectDispatch(negative=16)
+		
+		for i in range(3):
+			dispatch.resolve(None, Simple, path('/foo/bar/baz'))
+			dispatch.resolve(None, Simple, path('/foo/bar/diz'))
+		
+		assert (dispatch.negative.hits, dispatch.negative.misses) == (2, 1)  # Found attributes are not counted.
+	
+	def test_instance_precedence(self):
+		dispatch = ObjectDispatch(negative=16)
+		
+		assert not dispatch.resolve(None, Conditional, path('/extra')).endpoint
+		assert (Conditional, 'extra') in dispatch.negative
+		assert dispatch.resolve("context", Conditional, path('/extra')).handler == "extra"
+	
+	def test_descriptor_failure_not_remembered(self):
+		dispatch = ObjectDispatch(negative=16)
+		dispatch.resolve(None, Failing, path('/broken'))
+		
+		assert len(dispatch.negative) == 0
+	
+	def test_protected_not_remembered(self):
+		dispatch = ObjectDispatch(negative=16)
+		dispatch.resolve(None, Simple, path('/_protected'))
+		
+		assert len(dispatch.negative) == 0
+	
+	def test_bounded(self):
+		dispatch = ObjectDispatch(negative=4)
+		
+		for i in range(10):
+			dispatch.resolve(None, Root, path('/probe{}'.format(i)))
+		
+		assert dispatch.negative.stats == {'size': 4, 'capacity': 4, 'hits': 0, 'misses': 10, 'evictions': 6}
+	
+	def test_miss_event(self):
+		events = []
+		dispatch = ObjectDispatch(negative=16, listeners=[lambda dispatcher, event, context, **data: events.append(event)])
+		
+		dispatch.resolve(None, Root, path('/.env'))
+		first = list(events)
+		del events[:]
+		dispatch.resolve(None, Root, path('/.env'))
+		
+		assert events == first
+		assert 'miss' in events
+
+
+class TestDynamicMisses:
+	def test_not_remembered_by_default(self):
+		dispatch = ObjectDispatch(negative=16)
+		Counting.calls = 0
+		
+		dispatch.resolve(None, Counting, path('/missing'))
+		dispatch.resolve(None, Counting, path('/missing'))
+		
+		assert Counting.calls == 2
+		assert len(dispatch.negative) == 0
+	
+	def test_opt_in(self):
+		dispatch = ObjectDispatch(negative=16)
+		Remembered.calls = 0
+		
+		dispatch.resolve(None, Remembered, path('/missing'))
+		dispatch.resolve(None, Remembered, path('/missing'))
+		
+		assert Remembered.calls == 1
+	
+	def test_expiry(self):
+		dispatch = ObjectDispatch(negative=NegativeCache(16, ttl=0))
+		Remembered.calls = 0
+		
+		dispatch.resolve(None, Remembered, path('/missing'))
+		dispatch.resolve(None, Remembered, path('/missing'))
+		
+		assert Remembered.calls == 2
+	
+	def test_asynchronous(self):
+		dispatch = AsyncObjectDispatch(negative=16)
+		AsyncRemembered.calls = 0
+		loop = new_event_loop()
+		
+		try:
+			for i in range(2):
+				result = loop.run_until_complete(dispatch.resolve(None, AsyncRemembered, path('/missing')))
+				assert list(result.remaining) == ['missing']
+		
+		finally:
+			loop.close()
+		
+		assert AsyncRemembered.calls == 1
@@ -0,0 +1,81 @@
+from collections import deque
+from pathlib import PurePosixPath
+
+from pytest import mark
+
+from web.dispatch.core import prepare_path
+from web.dispatch.object import ObjectDispatch
+from web.dispatch.object.path import decode, split, extent
+
+from crudlike import Root
+from sample import path, shape, Simple
+
+
+dispatch = ObjectDispatch()
+
+
+class TestSplit:
+	@mark.parametrize('value', ['', '/', '/foo', '/foo/', 'foo/bar', '/foo//bar', '/./foo/./bar/', '//foo', '/foo/..'])
+	def test_equivalent_strings(self, value):
+		assert list(split(value)) == list(prepare_path(value))
+		assert list(split(value.encode('utf-8'))) == list(prepare_path(value))
+		assert list(split(PurePosixPath(value))) == list(prepare_path(value))
+	
+	def test_sequences_not_copied(self):
+		elements = ['foo', 'bar']
+		assert split(elements) is elements
+		
+		elements = ('foo', 'bar')
+		assert split(elements) is elements
+	
+	def test_iterables(self):
+		assert split(deque(['foo', 'bar'])) == ('foo', 'bar')
+		assert split(iter(['foo', 'bar'])) == ('foo', 'bar')
+	
+	def test_decoding(self):
+		assert split('/caf\xe9'.encode('utf-8')) == ['caf\xe9']
+		assert split(bytearray(b'/foo/bar')) == ['foo', 'bar']
+		assert split(b'/\xff') == ['\udcff']  # Invalid UTF-8 is preserved, not rejected.
+	
+	def test_cached(self):
+		first, = split(b'/' + b'cached-segment')
+		second, = split(b'/cached' + b'-segment')
+		
+		assert first is second
+		assert decode(b'cached-segment') is first
+	
+	def test_extent(self):
+		assert extent(['foo', 'bar']) == 2
+		assert extent(['foo', '', '']) == 1
+		assert extent(['']) == 0
+		assert extent([]) == 0
+
+
+class TestIntake:
+	@mark.parametrize('route', ['/', '/foo', '/foo/bar/baz', '/foo/bar/diz', '/_protected', '/static/'])
+	def test_equivalent_forms(self, route):
+		expected = shape(dispatch(None, Simple, path(route)))
+		
+		assert shape(dispatch(None, Simple, route)) == expected
+		assert shape(dispatch(None, Simple, route.encode('utf-8'))) == expected
+		assert shape(dispatch(None, Simple, route.split('/')[1:])) == expected
+		assert shape(dispatch(None, Simple, tuple(route.split('/')[1:]))) == expected
+	
+	def test_sequence_unmodified(self):
+		elements = ['user', 'alice', 'foo', '']
+		list(dispatch(None, Root, elements))
+		dispatch.resolve(None, Root, elements)
+		
+		assert elements == ['user', 'alice', 'foo', '']
+	
+	def test_remaining(self):
+		result = dispatch.resolve(None, Simple, b'/foo/bar/diz/qux/')
+		
+		assert result.path == 'bar'
+		assert result.remaining == deque(['diz', 'qux'])
+		
+		assert dispatch.resolve(None, Simple, ['foo', 'bar', 'baz']).remaining == deque()
+	
+	def test_batch(self):
+		results = dispatch.batch(None, Simple, [b'/foo/bar/baz', ['foo', 'bar', 'baz'], '/foo/bar/baz'])
+		assert shape(results[0]) == shape(results[1]) == shape(results[2])
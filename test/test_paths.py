@@ -0,0 +1,138 @@
+from pytest import mark
+
+from web.dispatch.object import ObjectDispatch
+from web.dispatch.object.cache import PathCache
+
+from crudlike import Root, Person
+from sample import path, shape, Simple, CallableDeep, AnonymousDynamicAttribute
+
+
+ROUTES = [(Simple, route) for route in ('/', '/foo', '/foo/bar', '/foo/bar/baz', '/foo/bar/diz', '/foo/diz/baz',
+		'/_protected', '/static', '/static/foo', '/missing')] + [(CallableDeep, '/foo/bar'),
+		(AnonymousDynamicAttribute, '/foo'), (Root, '/user'), (Root, '/user/alice/foo'), (Root, '/wp-admin/setup.php')]
+
+
+class Counted:
+	instances = 0
+	
+	def __init__(self, context=None):
+		Counted.instances += 1
+		self.context = context
+	
+	class child:
+		def __init__(self, context=None):
+			self.context = context
+		
+		def leaf(self):
+			return "leaf"
+
+
+class Opted:
+	__dispatch_cache__ = False
+	
+	class child:
+		def leaf(self):
+			return "leaf"
+
+
+class Shadowing:
+	class child:
+		def leaf(self):
+			return "leaf"
+	
+	def __init__(self, context=None):
+		if context:
+			self.child = Person
+
+
+@mark.parametrize('root,route', ROUTES, ids=['{}:{}'.format(root.__name__, route) for root, route in ROUTES])
+def test_equivalent(root, route):
+	dispatch = ObjectDispatch(paths=64)
+	expected = shape(ObjectDispatch()(None, root, path(route)))
+	generic = ObjectDispatch().resolve(None, root, path(route))
+	
+	for i in range(2):  # Analysed, then replayed.
+		assert shape(dispatch(None, root, path(route))) == expected
+		
+		result = dispatch.resolve(None, root, path(route))
+		assert shape([result]) == shape([generic])
+		assert list(result.remaining) == list(generic.remaining)
+
+
+class TestPathCache:
+	def test_stats(self):
+		dispatch = ObjectDispatch(paths=16)
+		
+		for i in range(3):
+			dispatch.resolve(None, Simple, '/foo/bar/baz')
+			dispatch.resolve(None, Root, '/user/alice')
+		
+		stats = dispatch.paths.stats
+		assert (stats['hits'], stats['misses'], stats['bypassed']) == (2, 2, 2)
+		assert stats['rate'] == 2 / 6
+		assert dispatch.paths.get((Root, ('user', 'alice'))) is False
+	
+	def test_normalized(self):
+		dispatch = ObjectDispatch(paths=16)
+		
+		dispatch.resolve(None, Simple, '/foo/bar/')
+		dispatch.resolve(None, Simple, ['foo', 'bar'])
+		dispatch.resolve(None, Simple, b'/foo/bar')
+		
+		assert len(dispatch.paths) == 1
+		assert dispatch.paths.hits == 2
+	
+	def test_context(self):
+		dispatch = ObjectDispatch(paths=16)
+		Counted.instances = 0
+		
+		for context in ('first', 'second'):
+			result = dispatch.resolve(context, Counted, '/child/leaf')
+			
+			assert result.endpoint
+			assert result.handler.__self__.context == context
+		
+		assert Counted.instances == 2  # Instances are constructed for each dispatch, never cached.
+	
+	def test_opt_out(self):
+		dispatch = ObjectDispatch(paths=16)
+		
+		assert dispatch.resolve(None, Opted, '/child/leaf').endpoint
+		assert dispatch.paths.get((Opted, ('child', 'leaf'))) is False
+	
+	def test_shadowed(self):
+		dispatch = ObjectDispatch(paths=16)
+		
+		assert dispatch.resolve(None, Shadowing, '/child/leaf').endpoint
+		assert dispatch.resolve('context', Shadowing, '/child/foo').handler.__self__.__class__ is Person
+		assert shape(dispatch('context', Shadowing, '/child/foo')) == \
+				shape(ObjectDispatch()('context', Shadowing, '/child/foo'))
+	
+	def test_listeners(self):
+		events = []
+		dispatch = ObjectDispatch(paths=16, listeners=[lambda dispatch, event, context, **data: events.append(event)])
+		
+		dispatch.resolve(None, Simple, '/foo/bar/baz')
+		
+		assert not len(dispatch.paths)
+		assert 'terminus' in events
+	
+	def test_flood_does_not_evict(self):
+		dispatch = ObjectDispatch(paths=8, cache=1024, negative=1024)
+		dispatch.resolve(None, Simple, '/foo/bar/baz')
+		
+		for i in range(100):
+			dispatch.resolve(None, Simple, '/probe{}'.format(i))
+			dispatch.resolve(None, Simple, '/foo/probe{}'.format(i))
+			dispatch.resolve(None, Simple, '/_probe{}'.format(i))
+		
+		assert dispatch.paths.evictions == 0 and len(dispatch.paths) == 1
+		
+		dispatch.resolve(None, Simple, '/foo/bar/baz')
+		assert dispatch.paths.hits == 1
+	
+	def test_instances(self):
+		paths = PathCache(4)
+		
+		assert ObjectDispatch(paths=paths).paths is paths
+		assert ObjectDispatch().paths is None
@@ -0,0 +1,150 @@
+import re
+
+from web.dispatch.object import ObjectDispatch, Policy, RouteTable
+from web.dispatch.object.policy import policy
+
+from crudlike import Root
+from sample import path, shape, Simple
+
+
+class Users:
+	__dispatch_policy__ = {'allow': ['admin', re.compile(r'[a-z][a-z0-9]{2,15}')], 'length': 16}
+	
+	calls = 0
+	
+	def __init__(self, context=None):
+		pass
+	
+	def __getattr__(self, name):
+		Users.calls += 1
+		return "user:" + name
+	
+	def listing(self):
+		return "listing"
+
+
+class Guarded:
+	__dispatch_policy__ = Policy(deny=['secret'])
+	
+	def secret(self):
+		return "secret"
+	
+	def public(self):
+		return "public"
+
+
+scanners = Policy(prefixes=['.', 'wp-'], deny=[re.compile(r'\.(php|asp)$')])
+
+
+class TestPolicy:
+	def test_length(self):
+		assert Policy(length=3)('foo')
+		assert not Policy(length=3)('fooo')
+	
+	def test_deny(self):
+		rules = Policy(deny=['env', re.compile(r'\.php$')], prefixes=['.', 'wp-'])
+		
+		assert rules('users')
+		assert not rules('env')
+		assert not rules('.git')
+		assert not rules('wp-admin')
+		assert not rules('setup.php')
+		assert rules('php')
+	
+	def test_allow(self):
+		rules = Policy(allow=['admin', re.compile(r'[a-z]+')])
+		
+		assert rules('admin')
+		assert rules('alice')
+		assert not rules('alice2')  # Allowed expressions must match the whole element.
+		assert not Policy(allow=[])('anything')
+	
+	def test_flags(self):
+		rules = Policy(deny=[re.compile('admin', re.I), re.compile(r'\.php$')])
+		
+		assert not rules('ADMIN')
+		assert not rules('setup.php')
+		assert rules('users')
+		
+		rules = Policy(deny=[re.compile('(?i)admin'), re.compile('root')], allow=[re.compile('(?i)[a-z]+')])
+		
+		assert not rules('Admin')
+		assert not rules('root')
+		assert not rules('alice2')
+		assert rules('Alice')
+	
+	def test_deny_precedes_allow(self):
+		assert not Policy(allow=['admin'], deny=['admin'])('admin')
+	
+	def test_compiled_once(self):
+		compiled = policy(Users)
+		
+		assert isinstance(compiled, Policy)
+		assert policy(Users) is compiled
+		assert policy(Simple) is None
+
+
+class TestDispatch:
+	def check(self, dispatch):
+		Users.calls = 0
+		
+		assert dispatch.resolve(None, Users, path('/alice')).handler == "user:alice"
+		assert dispatch.resolve(None, Users, path('/listing')).endpoint
+		assert Users.calls == 1
+		
+		for rejected in ('/Alice', '/wp-login.php', '/' + 'a' * 20, '/x'):
+			result = dispatch.resolve(None, Users, path(rejected))
+			assert isinstance(result.handler, Users)
+			assert list(result.remaining) == [rejected[1:]]
+		
+		assert Users.calls == 1  # The rejected elements never reached __getattr__.
+	
+	def test_uncached(self):
+		self.check(ObjectDispatch())
+	
+	def test_cached(self):
+		dispatch = ObjectDispatch(cache=64)
+		self.check(dispatch)
+		self.check(dispatch)
+	
+	def test_static_denial(self):
+		for dispatch in (ObjectDispatch(), ObjectDispatch(cache=64)):
+			assert dispatch.resolve(None, Guarded, path('/public')).endpoint
+			assert list(dispatch.resolve(None, Guarded, path('/secret')).remaining) == ['secret']
+	
+	def test_protected_event(self):
+		events = []
+		dispatch = ObjectDispatch(listeners=[lambda dispatcher, event, context, **data: events.append(event)])
+		dispatch.resolve(None, Guarded, path('/secret'))
+		
+		assert 'protected' in events
+		assert 'miss' not in events
+	
+	def test_dispatcher_policy(self):
+		for dispatch in (ObjectDispatch(policy=scanners), ObjectDispatch(policy=scanners, cache=64)):
+			for rejected, remaining in (('/.env', 1), ('/wp-admin/setup.php', 2), ('/user/index.php', 1)):
+				assert list(dispatch.resolve(None, Root, path(rejected)).remaining) == rejected.split('/')[-remaining:]
+			
+			assert dispatch.resolve(None, Root, path('/user/alice')).endpoint
+	
+	def test_unrestricted(self):
+		assert shape(ObjectDispatch(policy=Policy())(None, Simple, path('/foo/bar/baz'))) == \
+				shape(ObjectDispatch()(None, Simple, path('/foo/bar/baz')))
+
+
+class TestEnumeration:
+	def test_trace(self):
+		for static in (False, True):
+			names = [str(crumb.path) for crumb in ObjectDispatch(static=static).trace(None, Guarded)]
+			assert names == ['public']
+			
+			dispatch = ObjectDispatch(static=static, policy=Policy(deny=['public']))
+			names = [str(crumb.path) for crumb in dispatch.trace(None, Guarded())]
+			assert names == []
+	
+	def test_route_table(self):
+		table = RouteTable.compile(Guarded)
+		assert (Guarded, 'secret') not in table.entries
+		
+		dispatch = ObjectDispatch(policy=Policy(deny=['public']), routes=table)
+		assert (Guarded, 'public') not in dispatch.cache
@@ -0,0 +1,61 @@
+from collections import deque
+
+from web.dispatch.core import Crumb
+from web.dispatch.object import ObjectDispatch, Resolution
+
+from crudlike import Root, Person
+from sample import path, shape, function, Simple, CallableShallow, CallableDeep, CallableMixed, \
+		AnonymousDynamicAttribute
+
+
+dispatch = ObjectDispatch()
+cached = ObjectDispatch(cache=64)
+
+SCENARIOS = [
+		(function, '/foo/bar'),
+		(Simple, '/'),
+		(Simple, '/foo'),
+		(Simple, '/foo/bar/baz'),
+		(Simple, '/foo/bar/diz'),
+		(Simple, '/foo/bar/'),
+		(Simple, '/_protected'),
+		(Simple, '/static/foo'),
+		(CallableShallow, '/foo/bar/baz'),
+		(CallableDeep, '/foo/bar/baz'),
+		(CallableMixed, '/foo/diz'),
+		(AnonymousDynamicAttribute, '/foo'),
+		(Root, '/user/GothAlice/foo'),
+		(Root, '/wp-admin/setup.php'),
+	]
+
+
+class TestResolve:
+	def test_equivalence(self):
+		for dispatcher in (dispatch, cached):
+			for root, target in SCENARIOS:
+				expect = list(dispatcher(None, root, path(target)))[-1]
+				result = dispatcher.resolve(None, root, path(target))
+				
+				assert isinstance(result, Resolution)
+				assert shape([expect]) == shape([Crumb(dispatcher, root, result.path, result.endpoint, result.handler,
+						result.options)])
+	
+	def test_remaining(self):
+		assert dispatch.resolve(None, Simple, '/foo/bar/').remaining == deque()
+		assert dispatch.resolve(None, Simple, '/foo/diz/baz').remaining == deque(['diz', 'baz'])
+		assert dispatch.resolve(None, Simple, '/_protected').remaining == deque(['_protected'])
+	
+	def test_endpoint(self):
+		result = dispatch.resolve(None, Root, path('/user/GothAlice/foo/bar'))
+		
+		assert list(result.remaining) == ['bar']
+		assert result.path == 'foo'
+		assert result.endpoint
+		assert result.handler.__func__ is Person.foo
+	
+	def test_events(self):
+		seen = []
+		local = ObjectDispatch(listeners=[lambda dispatcher, event, context, **data: seen.append(event)])
+		local.resolve(None, Simple, '/foo/diz')
+		
+		assert seen == ['instantiate', 'descend', 'instantiate', 'miss', 'terminus']
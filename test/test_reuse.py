@@ -0,0 +1,84 @@
+from pytest import raises
+
+from web.dispatch.object import ObjectDispatch
+
+from sample import path, shape, init
+
+
+class Context:
+	pass
+
+
+class Shared:
+	__dispatch_reuse__ = 'process'
+	
+	class child:
+		__dispatch_reuse__ = 'process'
+		
+		def action(self):
+			return self
+
+
+class Scoped:
+	__dispatch_reuse__ = 'context'
+	__init__ = init
+	
+	class child:
+		__dispatch_reuse__ = 'context'
+		__init__ = init
+
+
+class Fresh:
+	__init__ = init
+
+
+class Invalid:
+	__dispatch_reuse__ = 'forever'
+
+
+class TestProcessReuse:
+	def test_reused(self):
+		dispatch = ObjectDispatch()
+		first = list(dispatch(None, Shared, path('/child/action')))
+		second = list(dispatch(None, Shared, path('/child/action')))
+		
+		assert shape(first) == shape(second)
+		assert first[0].handler is second[0].handler
+		assert first[-1].handler() is second[-1].handler()
+	
+	def test_per_dispatcher(self):
+		assert list(ObjectDispatch()(None, Shared, ''))[0].handler is not list(ObjectDispatch()(None, Shared, ''))[0].handler
+
+
+class TestContextReuse:
+	def test_reused_within_context(self):
+		dispatch = ObjectDispatch()
+		context = Context()
+		
+		first = list(dispatch(context, Scoped, path('/child')))
+		second = list(dispatch(context, Scoped, path('/child')))
+		
+		assert first[0].handler is second[0].handler
+		assert first[-1].handler is second[-1].handler
+		assert first[-1].handler._ctx is context
+		assert set(context._dispatch_instances) == {Scoped, Scoped.child}
+	
+	def test_distinct_contexts(self):
+		dispatch = ObjectDispatch()
+		assert list(dispatch(Context(), Scoped, ''))[0].handler is not list(dispatch(Context(), Scoped, ''))[0].handler
+	
+	def test_no_context(self):
+		dispatch = ObjectDispatch()
+		assert list(dispatch(None, Scoped, ''))[0].handler is not list(dispatch(None, Scoped, ''))[0].handler
+
+
+class TestDefault:
+	def test_not_reused(self):
+		dispatch = ObjectDispatch()
+		context = Context()
+		assert list(dispatch(context, Fresh, ''))[0].handler is not list(dispatch(context, Fresh, ''))[0].handler
+		assert not hasattr(context, '_dispatch_instances')
+	
+	def test_invalid_scope(self):
+		with raises(ValueError):
+			list(ObjectDispatch()(None, Invalid, ''))
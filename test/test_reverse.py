@@ -0,0 +1,99 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import raises
+
+from web.dispatch.object import ObjectDispatch, ReverseIndex
+
+from crudlike import Root, People, Person
+from sample import path, Simple
+
+
+class Shared:
+	def action(self):
+		return "action"
+
+
+class First:
+	shared = Shared
+
+
+class Second:
+	shared = Shared
+
+
+class Mounted:
+	first = First
+	second = Second
+
+
+class TestReverseIndex:
+	def test_static(self):
+		index = ReverseIndex().mount(Simple)
+		
+		assert index.path(Simple) == '/'
+		assert index.path(Simple.foo) == '/foo'
+		assert index.path(Simple.foo.bar.baz) == '/foo/bar/baz'
+	
+	def test_bound(self):
+		index = ReverseIndex().mount(Simple)
+		assert index.path(Simple.foo.bar().baz) == '/foo/bar/baz'
+	
+	def test_dynamic(self):
+		index = ReverseIndex().mount(Root)
+		
+		assert index.templates(Person.foo) == ('/user/{username}/foo', )
+		assert index.path(Person.foo, username='alice') == '/user/alice/foo'
+		assert index.path(Person, username='a b/c') == '/user/a%20b%2Fc'  # Each value fills exactly one segment.
+		
+		with raises(LookupError):
+			index.path(Person.foo)
+	
+	def test_round_trip(self):
+		index = ReverseIndex().mount(Root)
+		dispatch = ObjectDispatch()
+		result = dispatch.resolve(None, Root, path(index.path(Person.foo, username='alice')))
+		
+		assert result.endpoint
+		assert result.handler.__func__ is Person.foo
+		assert not result.remaining
+	
+	def test_mounts(self):
+		index = ReverseIndex().mount(Root, '/api/').mount(Root, '/v2')
+		
+		assert index.path(People) == '/api/user'
+		assert index.path(Root) == '/api'
+		
+		index.build()
+		assert index.templates(People) == ('/api/user', '/v2/user')
+	
+	def test_shared(self):
+		index = ReverseIndex().mount(Mounted)
+		index.build()
+		
+		assert index.templates(Shared.action) == ('/first/shared/action', '/second/shared/action')
+	
+	def test_incremental(self):
+		index = ReverseIndex().mount(Simple).mount(Root)
+		
+		assert index.path(Simple.foo) == '/foo'
+		assert Person not in index.routes  # The second tree has not yet been walked.
+		assert index.path(Person, username='alice') == '/user/alice'
+	
+	def test_unknown(self):
+		index = ReverseIndex().mount(Simple)
+		
+		assert Person not in index
+		assert index.templates(Person) == ()
+		
+		with raises(LookupError):
+			index.path(Person)
+	
+	def test_concurrent(self):
+		index = ReverseIndex().mount(Root).mount(Simple)
+		targets = [Person.foo, Simple.foo.bar.baz, People, Simple] * 50
+		
+		with ThreadPoolExecutor(8) as executor:
+			found = list(executor.map(lambda obj: index.templates(obj)[0], targets))
+		
+		assert found[:4] == ['/user/{username}/foo', '/foo/bar/baz', '/user', '/']
+		assert found == found[:4] * 50
@@ -0,0 +1,83 @@
+from pytest import mark, raises
+
+from web.dispatch.object import ObjectDispatch, AsyncObjectDispatch, Resolver
+
+from crudlike import Root
+from sample import path, shape, Simple, CallableShallow, CallableDeep, CallableMixed, AnonymousDynamicAttribute
+
+
+dispatch = ObjectDispatch()
+
+CASES = [(Simple, route) for route in ('/', '', '/foo', '/foo/', '/foo/bar', '/foo/bar/baz', '/foo/bar/diz',
+		'/foo/diz/baz', '/_protected', '/also_protected', '/static', '/static/foo', '/missing')] + [
+		(CallableShallow, '/'), (CallableDeep, '/foo/bar'), (CallableMixed, '/foo/bar/baz'),
+		(AnonymousDynamicAttribute, '/foo'), (Root, '/user'), (Root, '/user/alice'), (Root, '/user/alice/foo'),
+		(Root, '/wp-admin/setup.php'),
+	]
+
+
+class Recursive:
+	def leaf(self):
+		return "leaf"
+
+Recursive.child = Recursive
+
+
+class Shadowed:
+	class nested:
+		def leaf(self):
+			return "leaf"
+	
+	def __init__(self, context=None):
+		self.nested = "shadow"
+
+
+@mark.parametrize('root,route', CASES, ids=['{}:{}'.format(root.__name__, route) for root, route in CASES])
+def test_equivalent(root, route):
+	resolver = dispatch.specialize(root)
+	assert shape(resolver(None, path(route))) == shape(dispatch(None, root, path(route)))
+	assert shape(resolver(None, route)) == shape(dispatch(None, root, route))
+
+
+class TestSpecialize:
+	def test_source(self):
+		resolver = dispatch.specialize(Simple)
+		
+		assert isinstance(resolver, Resolver)
+		assert resolver.source.startswith('def resolve(context, path):')
+		assert '# /foo/bar: Simple.foo.bar' in resolver.source
+		assert repr(resolver).startswith('Resolver(Simple, ')
+	
+	def test_recursive(self):
+		resolver = dispatch.specialize(Recursive)
+		
+		assert resolver.source.count('# /') == 1  # The cycle is left to generic dispatch.
+		assert shape(resolver(None, '/child/child/leaf')) == shape(dispatch(None, Recursive, '/child/child/leaf'))
+	
+	def test_depth(self):
+		resolver = dispatch.specialize(Simple, depth=1)
+		
+		assert '# /foo:' not in resolver.source
+		assert shape(resolver(None, '/foo/bar/baz')) == shape(dispatch(None, Simple, '/foo/bar/baz'))
+	
+	def test_shadowed(self):
+		resolver = dispatch.specialize(Shadowed)
+		assert shape(resolver(None, '/nested/leaf')) == shape(dispatch(None, Shadowed, '/nested/leaf'))
+	
+	def test_listeners(self):
+		events = []
+		resolver = ObjectDispatch(listeners=[lambda dispatch, event, context, **data: events.append(event)]).specialize(Simple)
+		crumbs = list(resolver(None, '/foo/bar/baz'))
+		
+		assert crumbs[-1].endpoint
+		assert events.count('instantiate') == 3 and events[-1] == 'terminus'  # Generic dispatch emits events.
+	
+	def test_invalid(self):
+		with raises(TypeError):
+			dispatch.specialize(Simple())
+		
+		with raises(ValueError):
+			ObjectDispatch(lazy=True).specialize(Simple)
+		
+		with raises(ValueError):
+			AsyncObjectDispatch().specialize(Simple)
@@ -0,0 +1,114 @@
+import json
+
+from web.dispatch.object import ObjectDispatch, Statistics
+from web.dispatch.object.stats import BOUNDS, OTHER, Histogram
+
+from crudlike import Root, People
+from sample import path, Simple
+
+
+def collect(*routes, **kw):
+	stats = Statistics(**kw)
+	dispatch = ObjectDispatch(listeners=[stats])
+	
+	for root, route in routes:
+		dispatch.resolve(None, root, path(route))
+	
+	return stats.snapshot()
+
+
+class TestHistogram:
+	def test_empty(self):
+		snapshot = Histogram().snapshot()
+		
+		assert snapshot['count'] == 0
+		assert snapshot['p50'] is None
+		assert snapshot['buckets'] == []
+	
+	def test_buckets(self):
+		histogram = Histogram()
+		
+		for duration in (0.5e-6, 1.5e-6, 1.5e-6, 3e-6, 100.0):
+			histogram.add(duration)
+		
+		assert histogram.snapshot()['buckets'] == [[1e-6, 1], [2e-6, 2], [4e-6, 1], [None, 1]]
+		assert len(histogram.counts) == len(BOUNDS) + 1
+		assert histogram.minimum == 0.5e-6
+		assert histogram.maximum == 100.0
+	
+	def test_quantiles(self):
+		histogram = Histogram()
+		
+		for i in range(99):
+			histogram.add(3e-6)
+		
+		histogram.add(0.01)
+		
+		assert histogram.quantile(0.5) == 4e-6
+		assert histogram.quantile(0.99) == 4e-6
+		assert histogram.quantile(1.0) == 0.01  # Never beyond the greatest duration recorded.
+
+
+class TestStatistics:
+	def test_prefixes(self):
+		snapshot = collect((Simple, '/foo/bar/baz'), (Simple, '/foo/bar/diz'), (Simple, '/foo'), (Root, '/'))
+		prefixes = snapshot['prefixes']
+		
+		assert sorted(prefixes) == ['/', '/foo', '/foo/bar']
+		assert prefixes['/foo/bar']['count'] == 2
+		assert prefixes['/foo/bar']['endpoints'] == 1
+		assert prefixes['/foo/bar']['interrupted'] == 1
+		assert prefixes['/foo/bar']['duration']['count'] == 2
+	
+	def test_depth(self):
+		snapshot = collect((Root, '/user/alice/foo'), (Root, '/user/bob'), depth=1)
+		assert list(snapshot['prefixes']) == ['/user']
+	
+	def test_classes(self):
+		snapshot = collect((Simple, '/foo/bar/baz'), (Simple, '/_protected'), (Simple, '/foo/bar/diz'))
+		classes = snapshot['classes']
+		
+		assert classes['sample.Simple']['instantiated'] == 3
+		assert classes['sample.Simple']['protected'] == 1
+		assert classes['sample.Simple']['construction']['count'] == 3
+		assert classes['sample.Simple.foo.bar']['misses'] == 1
+		assert classes['sample.Simple.foo.bar']['step']['count'] == 2
+		assert classes['sample.Simple.foo.bar']['dynamic']['count'] == 0
+	
+	def test_dynamic(self):
+		snapshot = collect((Root, '/user/alice'), (Root, '/user/bob'), (Root, '/user/__class__'))
+		people = snapshot['classes'][People.__module__ + '.' + People.__qualname__]
+		
+		assert people['dynamic']['count'] == 2  # Retrievals of names not declared by the class.
+		assert people['step']['count'] == 2
+		assert people['protected'] == 1
+	
+	def test_bounded(self):
+		snapshot = collect(*[(Root, '/user/name{}'.format(i)) for i in range(10)], limit=4)
+		prefixes = snapshot['prefixes']
+		
+		assert len(prefixes) == 5
+		assert prefixes[OTHER]['count'] == 6
+	
+	def test_serializable(self):
+		snapshot = collect((Simple, '/foo/bar/baz'), (Root, '/user/alice/foo'))
+		assert json.loads(json.dumps(snapshot)) == snapshot
+	
+	def test_iterative_and_batch(self):
+		stats = Statistics()
+		dispatch = ObjectDispatch(listeners=[stats])
+		
+		list(dispatch(None, Simple, path('/foo/bar/baz')))
+		dispatch.batch(None, Simple, [path('/foo/bar/baz'), path('/foo/bar/diz')])
+		
+		prefix = stats.snapshot()['prefixes']['/foo/bar']
+		
+		assert prefix['count'] == 3
+		assert prefix['duration']['count'] == 1  # The work of a batch is not attributed to individual paths.
+	
+	def test_reset(self):
+		stats = Statistics()
+		ObjectDispatch(listeners=[stats]).resolve(None, Simple, path('/foo'))
+		stats.reset()
+		
+		assert stats.snapshot() == {'prefixes': {}, 'classes': {}}
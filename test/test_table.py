@@ -0,0 +1,104 @@
+import json
+
+from pytest import raises
+
+from web.dispatch.object import ObjectDispatch, RouteTable
+from web.dispatch.object.cache import CLASS, ATTRIBUTE
+
+from crudlike import Root, People
+from sample import path, shape, Simple, CallableMixed
+
+
+dispatch = ObjectDispatch()
+
+
+class TestCompilation:
+	def test_nested_classes(self):
+		table = RouteTable.compile(Simple)
+		
+		assert table.entries[Simple, 'foo'] == (CLASS, Simple.foo)
+		assert table.entries[Simple.foo, 'bar'] == (CLASS, Simple.foo.bar)
+		assert table.entries[Simple.foo.bar, 'baz'] == (ATTRIBUTE, None)
+		assert table.entries[Simple, 'static'] == (ATTRIBUTE, None)
+	
+	def test_protected_omitted(self):
+		table = RouteTable.compile(Simple)
+		assert (Simple, '_protected') not in table.entries
+		assert (Simple, '__init__') not in table.entries
+		
+		table = RouteTable.compile(Simple, protect=False)
+		assert (Simple, '_protected') in table.entries
+	
+	def test_instance_root(self):
+		assert RouteTable.compile(Simple()).entries == RouteTable.compile(Simple).entries
+	
+	def test_dynamic_boundary(self):
+		table = RouteTable.compile(Root)
+		
+		assert table.entries == {(Root, 'user'): (CLASS, People)}
+	
+	def test_cycles(self):
+		class Node:
+			pass
+		
+		Node.child = Node
+		table = RouteTable.compile(Node)
+		
+		assert table.entries == {(Node, 'child'): (CLASS, Node)}
+
+
+class TestSnapshot:
+	def test_round_trip(self, tmp_path):
+		table = RouteTable.compile(CallableMixed)
+		table.dump(tmp_path / 'routes.json')
+		loaded = RouteTable.load(tmp_path / 'routes.json')
+		
+		assert loaded.protect is True
+		assert loaded.entries == table.entries
+		assert loaded.entries[CallableMixed, 'foo'][0] is CLASS
+	
+	def test_unimportable_omitted(self, tmp_path):
+		class Local:
+			class child:
+				pass
+		
+		RouteTable.compile(Local).dump(tmp_path / 'routes.json')
+		
+		assert len(RouteTable.load(tmp_path / 'routes.json')) == 0
+	
+	def test_unresolvable_skipped(self, tmp_path):
+		target = tmp_path / 'routes.json'
+		target.write_text(json.dumps({'version': 1, 'protect': True, 'entries': [
+				['sample:Simple', 'foo', 'class', 'sample:Simple.foo'],
+				['sample:Removed', 'foo', 'attribute', None],
+			]}))
+		
+		assert RouteTable.load(target).entries == {(Simple, 'foo'): (CLASS, Simple.foo)}
+	
+	def test_version(self, tmp_path):
+		target = tmp_path / 'routes.json'
+		target.write_text(json.dumps({'version': 0, 'protect': True, 'entries': []}))
+		
+		with raises(ValueError):
+			RouteTable.load(target)
+
+
+class TestInstallation:
+	def test_populates_cache(self):
+		table = RouteTable.compile(Simple)
+		preloaded = ObjectDispatch(routes=table)
+		
+		assert preloaded.cache.size == len(table)
+		assert len(preloaded.cache) == len(table)
+		
+		for route in ('/', '/foo', '/foo/bar', '/foo/bar/baz', '/foo/missing', '/static'):
+			assert shape(preloaded(None, Simple, path(route))) == shape(dispatch(None, Simple, path(route)))
+		
+		assert preloaded.cache.stats['hits'] > 0
+	
+	def test_protection_mismatch(self):
+		with raises(ValueError):
+			ObjectDispatch(protect=False, routes=RouteTable.compile(Simple))
+	
+	def test_empty(self):
+		assert ObjectDispatch(routes=RouteTable()).cache is None
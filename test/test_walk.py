@@ -0,0 +1,64 @@
+from web.dispatch.object import ObjectDispatch, Route
+
+from crudlike import Root, People, Person
+from sample import Simple, CallableMixed
+
+
+dispatch = ObjectDispatch(static=True)
+
+
+def paths(routes):
+	return [route.path for route in routes]
+
+
+class Cyclic:
+	def __call__(self):
+		return "cyclic"
+	
+	class child:
+		def leaf(self):
+			return "leaf"
+
+Cyclic.child.parent = Cyclic
+Cyclic.child.child = Cyclic.child
+
+
+class TestWalk:
+	def test_nested(self):
+		routes = list(dispatch.walk(None, CallableMixed))
+		
+		assert paths(routes) == ['/', '/foo', '/foo/bar', '/foo/bar/baz']
+		assert [route.endpoint for route in routes] == [True, False, False, True]
+		assert routes[2].handler is CallableMixed.foo.bar
+	
+	def test_dynamic_placeholder(self):
+		routes = list(dispatch.walk(None, Root))
+		
+		assert routes[1] == Route('/user', True, People, None)
+		assert routes[2] == Route('/user/{username}', True, Person, None)
+		assert paths(routes)[3:] == ['/user/{username}/foo']
+	
+	def test_instance_root(self):
+		assert paths(dispatch.walk(None, CallableMixed())) == paths(dispatch.walk(None, CallableMixed))
+	
+	def test_lazy(self):
+		routes = dispatch.walk(None, Simple)
+		
+		assert next(routes).path == '/'
+		assert next(routes).path == '/also_protected'
+	
+	def test_cycles(self):
+		routes = paths(dispatch.walk(None, Cyclic))
+		
+		assert routes == ['/', '/child', '/child/child', '/child/leaf', '/child/parent']
+	
+	def test_depth(self):
+		assert paths(dispatch.walk(None, CallableMixed, depth=0)) == ['/']
+		assert paths(dispatch.walk(None, CallableMixed, depth=2)) == ['/', '/foo', '/foo/bar']
+	
+	def test_limit(self):
+		assert paths(dispatch.walk(None, CallableMixed, limit=0)) == []
+		assert paths(dispatch.walk(None, CallableMixed, limit=3)) == ['/', '/foo', '/foo/bar']
+	
+	def test_evaluating_trace(self):
+		assert list(ObjectDispatch().walk(None, CallableMixed)) == list(dispatch.walk(None, CallableMixed))
@@ -0,0 +1,50 @@
+import gc
+
+from pytest import mark
+
+from web.dispatch.object import ObjectDispatch
+from web.dispatch.object.cache import CLASS
+from web.dispatch.object.introspect import _descriptions, invalidate
+
+from crudlike import Root, People
+from sample import path, shape, Simple
+
+
+class TestWarm:
+	def test_populates_cache(self):
+		dispatch = ObjectDispatch(cache=64)
+		table = dispatch.warm(Simple, freeze=False)
+		
+		assert len(table)
+		assert len(dispatch.cache) == len(table)
+		assert dispatch.cache.get((Simple, 'foo')) == (CLASS, Simple.foo)
+		
+		hits = dispatch.cache.hits
+		list(dispatch(None, Simple, path('/foo/bar/baz')))
+		assert dispatch.cache.hits - hits == 3  # No classification was needed.
+	
+	def test_populates_analysis(self):
+		invalidate()
+		ObjectDispatch(static=True).warm(Root(), freeze=False)
+		
+		assert Root in _descriptions
+		assert People in _descriptions
+	
+	def test_uncached(self):
+		dispatch = ObjectDispatch()
+		dispatch.warm(Simple, freeze=False)
+		
+		assert dispatch.cache is None
+		assert shape(dispatch(None, Simple, path('/foo/bar/baz'))) == \
+				shape(ObjectDispatch()(None, Simple, path('/foo/bar/baz')))
+	
+	@mark.skipif(not hasattr(gc, 'freeze'), reason="gc.freeze requires Python 3.7 or later")
+	def test_freeze(self):
+		gc.unfreeze()
+		
+		try:
+			ObjectDispatch(cache=64).warm(Simple)
+			assert gc.get_freeze_count() > 0
+		
+		finally:
+			gc.unfreeze()
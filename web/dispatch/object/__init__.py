@@ -1,2 +1,45 @@
 from .release import version as __version__
-from .dispatch import ObjectDispatch
+from .dispatch import ObjectDispatch, Resolution
+from .policy import Policy
+
+
+LAZY = {  # Names imported only when first accessed, sparing short-lived processes the modules they require.
+		'AsyncObjectDispatch': 'asynchronous',
+		'memoize': 'memo',
+		'Statistics': 'stats',
+		'RouteTable': 'table',
+		'ReverseIndex': 'reverse',
+		'Resolver': 'specialize',
+		'Route': 'walk',
+	}
+
+
+def __getattr__(name):
+	"""Import the module providing the given name on first access; see PEP 562."""
+	
+	if name not in LAZY:
+		raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+	
+	from importlib import import_module
+	
+	value = globals()[name] = getattr(import_module('.' + LAZY[name], __name__), name)
+	
+	return value
+
+
+def __dir__():
+	return sorted(set(globals()) | set(LAZY))
+
+
+def _eager():
+	"""Import every lazily provided name immediately where module-level `__getattr__` is unsupported, before 3.7."""
+	
+	import sys
+	
+	if sys.version_info < (3, 7):
+		for name in LAZY:
+			__getattr__(name)
+
+
+_eager()
+del _eager
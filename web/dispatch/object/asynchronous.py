@@ -0,0 +1,217 @@
+"""Asynchronous object dispatch, for use within an asyncio event loop."""
+
+from asyncio import ensure_future, isfuture
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from inspect import isawaitable
+from time import perf_counter
+
+from ..core import Crumb, nodefault
+from .cache import lookup_static
+from .dispatch import ObjectDispatch, Resolution, elapsed
+from .meta import metadata
+from .path import split, extent
+from .predicate import isclass
+
+try:
+	from asyncio import get_running_loop
+except ImportError:  # Python 3.6; called only from within coroutines, where the current loop is the running one.
+	from asyncio import get_event_loop as get_running_loop
+
+
+class AsyncObjectDispatch(ObjectDispatch):
+	"""Object dispatch which awaits awaitable attributes and instances encountered during descent.
+	
+	A `__getattr__` method may be a coroutine, e.g. to load a record from a database without blocking the event loop.
+	If it raises `AttributeError` when awaited, the attribute is considered missing, as usual. Similarly, should
+	instantiation of a class produce an awaitable object, such as an instance implementing `__await__` to complete its
+	own initialization, it is awaited, and the result used in its place. For classes declaring `__dispatch_reuse__`, the
+	result is what is retained for reuse; concurrent requests arriving while it is being constructed await the same one.
+	
+	Where the lookup performed by `__getattr__` is not asynchronous, but does block, the class may declare itself
+	`__dispatch_blocking__`. If the dispatcher was given a number of `workers`, dynamic attribute lookups on instances of
+	such classes are performed within a thread pool of that size, rather than within the event loop.
+	
+	Calling the dispatcher produces an asynchronous generator; `resolve` is a coroutine. Trace is unchanged. Batch
+	dispatch, which never awaits, is unsupported; resolve each path instead.
+	"""
+	
+	__slots__ = ['executor']
+	
+	def __init__(self, *args, workers=0, **kw):
+		super(AsyncObjectDispatch, self).__init__(*args, **kw)
+		
+		self.executor = ThreadPoolExecutor(workers) if workers else None
+	
+	def close(self):
+		"""Shut down the worker pool used for blocking lookups, if any, waiting for outstanding lookups to complete."""
+		
+		if self.executor is not None:
+			self.executor.shutdown()
+	
+	def batch(self, context, obj, paths):
+		raise TypeError("Batch dispatch is synchronous; resolve each path using the asynchronous dispatcher instead.")
+	
+	def _reuse(self, cls, context):
+		instance = super(AsyncObjectDispatch, self)._reuse(cls, context)
+		
+		if not isawaitable(instance) or isfuture(instance):
+			return instance
+		
+		pool = self._pool(cls, context)
+		
+		if pool is None:
+			return instance
+		
+		pending = ensure_future(instance)  # Unlike a coroutine, may be awaited by any number of requests.
+		pool[cls] = pending
+		pending.add_done_callback(lambda pending: self._retain(pool, cls, pending))
+		
+		return pending
+	
+	@staticmethod
+	def _retain(pool, cls, pending):
+		"""Replace the pending construction of a reusable instance with its result, or forget it, should it fail."""
+		
+		if pool.get(cls) is not pending:
+			return
+		
+		if pending.cancelled() or pending.exception() is not None:
+			del pool[cls]
+		else:
+			pool[cls] = pending.result()
+	
+	async def _instantiate_async(self, cls, context, terminus=False):
+		obj = self._instantiate(cls, context, terminus)
+		
+		if isawaitable(obj):
+			obj = await obj
+		
+		return obj
+	
+	async def _attribute_async(self, context, obj, name):
+		cls = type(obj)
+		started = perf_counter() if self.hooks else None
+		
+		if self.executor is not None and lookup_static(cls, '__dispatch_blocking__', False) and \
+				lookup_static(cls, name) is nodefault:
+			new = await get_running_loop().run_in_executor(self.executor, self._retrieve, context, obj, name)
+		else:
+			new = self._retrieve(context, obj, name)
+		
+		if isawaitable(new):
+			try:
+				new = await new
+			except AttributeError:
+				new = nodefault
+				
+				if self.negative is not None:
+					self.negative.record(obj, name)
+				
+				if self.hooks:
+					self._emit('miss', context, handler=obj, segment=name, duration=elapsed(started))
+		
+		if self.hooks and new is not nodefault:
+			self._emit('descend', context, parent=obj, segment=name, handler=new, duration=elapsed(started))
+		
+		return new
+	
+	async def __call__(self, context, obj, path):
+		origin = obj
+		lazy = self.lazy
+		previous = current = None
+		started = perf_counter() if self.hooks else None
+		
+		path = split(path)
+		end = extent(path)
+		index = 0
+		
+		while index < end:
+			current = path[index]
+			new = self._nested(context, obj, current) if lazy and isclass(obj) else nodefault
+			
+			if new is nodefault:
+				if isclass(obj):
+					obj = await self._instantiate_async(obj, context)
+					yield Crumb(self, origin, handler=obj)
+				
+				new = await self._attribute_async(context, obj, current)
+			
+			if new is nodefault:
+				break
+			
+			yield Crumb(self, origin, path=previous, handler=obj)
+			
+			previous = current
+			index += 1
+			obj = new
+		
+		else:
+			if isclass(obj) and getattr(obj, '__dispatch__', 'object') == 'object':
+				obj = await self._instantiate_async(obj, context, True)
+			
+			endpoint = metadata(obj).endpoint
+			
+			if self.hooks:
+				self._emit('terminus', context, handler=obj, endpoint=endpoint, segment=None, path=tuple(path[:end]),
+						duration=elapsed(started))
+			
+			yield Crumb(self, origin, path=current, endpoint=endpoint, handler=obj)
+			return
+		
+		meta = metadata(obj)
+		endpoint = meta.partial
+		
+		if self.hooks:
+			self._emit('terminus', context, handler=obj, endpoint=endpoint, segment=current, path=tuple(path[:index]),
+					duration=elapsed(started))
+		
+		yield Crumb(self, origin, path=previous, endpoint=endpoint, handler=obj, options=meta.options)
+	
+	async def resolve(self, context, obj, path):
+		"""Resolve the given path, returning only the final outcome of dispatch as a `Resolution`."""
+		
+		lazy = self.lazy
+		previous = None
+		started = perf_counter() if self.hooks else None
+		path = split(path)
+		end = extent(path)
+		index = 0
+		
+		while index < end:
+			current = path[index]
+			new = self._nested(context, obj, current) if lazy and isclass(obj) else nodefault
+			
+			if new is nodefault:
+				if isclass(obj):
+					obj = await self._instantiate_async(obj, context)
+				
+				new = await self._attribute_async(context, obj, current)
+			
+			if new is nodefault:
+				break
+			
+			previous = current
+			index += 1
+			obj = new
+		
+		else:
+			if isclass(obj) and getattr(obj, '__dispatch__', 'object') == 'object':
+				obj = await self._instantiate_async(obj, context, True)
+			
+			endpoint = metadata(obj).endpoint
+			
+			if self.hooks:
+				self._emit('terminus', context, handler=obj, endpoint=endpoint, segment=None, path=tuple(path[:end]),
+						duration=elapsed(started))
+			
+			return Resolution(obj, endpoint, None, previous, deque())
+		
+		meta = metadata(obj)
+		endpoint = meta.partial
+		
+		if self.hooks:
+			self._emit('terminus', context, handler=obj, endpoint=endpoint, segment=current, path=tuple(path[:index]),
+					duration=elapsed(started))
+		
+		return Resolution(obj, endpoint, meta.options, previous, deque(path[index:end]))
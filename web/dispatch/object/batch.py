@@ -0,0 +1,119 @@
+"""Dispatch of many paths against a common root, walking each shared prefix only once."""
+
+
+from ..core import Crumb, nodefault
+from .meta import metadata
+from .path import split, extent
+from .predicate import isclass
+
+
+def segments(path):
+	"""Prepare a path for batch dispatch, returning a tuple of its elements without any trailing separators."""
+	
+	path = split(path)
+	
+	return tuple(path[:extent(path)])
+
+
+def trie(paths):
+	"""Arrange the given paths into a prefix tree.
+	
+	Each node is a `(children, indices)` tuple, where `children` maps a path element to a child node, and `indices`
+	lists the positions, within the given sequence of paths, of those paths ending at that node.
+	"""
+	
+	root = ({}, [])
+	
+	for index, path in enumerate(paths):
+		node = root
+		
+		for segment in path:
+			children = node[0]
+			node = children.get(segment)
+			
+			if node is None:
+				node = children[segment] = ({}, [])
+		
+		node[1].append(index)
+	
+	return root
+
+
+def indices(node):
+	"""Enumerate the indices of all paths ending at or beneath the given node."""
+	
+	stack = [node]
+	
+	while stack:
+		children, ending = stack.pop()
+		yield from ending
+		stack.extend(children.values())
+
+
+def batch(dispatch, context, obj, paths):
+	"""Dispatch each of the given paths from the given root object, returning a list of the crumbs of each.
+	
+	The results are equivalent to those of calling the dispatcher once per path, except that any classes encountered
+	along shared prefixes are instantiated, and attributes retrieved, only once; instances are shared between the
+	results of paths which pass through them.
+	"""
+	
+	origin = obj
+	results = [None] * len(paths)
+	stack = [(trie([segments(path) for path in paths]), obj, (), [])]
+	
+	while stack:
+		(children, ending), obj, trail, crumbs = stack.pop()
+		previous = trail[-1] if trail else None
+		instance = None
+		
+		if ending:  # Some paths are exhausted here; this is the terminus of their dispatch.
+			handler = obj
+			
+			if isclass(obj) and getattr(obj, '__dispatch__', 'object') == 'object':
+				handler = instance = dispatch._instantiate(obj, context, True)
+			
+			endpoint = metadata(handler).endpoint
+			
+			if dispatch.hooks:
+				dispatch._emit('terminus', context, handler=handler, endpoint=endpoint, segment=None, path=trail,
+						duration=None)
+			
+			final = crumbs + [Crumb(dispatch, origin, path=previous, endpoint=endpoint, handler=handler)]
+			
+			for index in ending:
+				results[index] = list(final)
+		
+		if not children:
+			continue
+		
+		if isclass(obj):  # Instantiated once, on behalf of all paths descending further.
+			if instance is None:
+				instance = dispatch._instantiate(obj, context)
+			
+			obj = instance
+			crumbs = crumbs + [Crumb(dispatch, origin, handler=obj)]
+		
+		step = Crumb(dispatch, origin, path=previous, handler=obj)
+		interrupted = None
+		
+		for segment, child in children.items():
+			new = dispatch._attribute(context, obj, segment)
+			
+			if new is not nodefault:
+				stack.append((child, new, trail + (segment, ), crumbs + [step]))
+				continue
+			
+			if interrupted is None:  # The same for every path interrupted at this point.
+				meta = metadata(obj)
+				interrupted = crumbs + [Crumb(dispatch, origin, path=previous, endpoint=meta.partial, handler=obj,
+						options=meta.options)]
+			
+			if dispatch.hooks:
+				dispatch._emit('terminus', context, handler=obj, endpoint=interrupted[-1].endpoint, segment=segment,
+						path=trail, duration=None)  # The work of a batch is shared; it can not be attributed to one path.
+			
+			for index in indices(child):
+				results[index] = list(interrupted)
+	
+	return results
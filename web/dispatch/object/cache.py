@@ -0,0 +1,364 @@
+"""Bounded caches used to accelerate repeated object dispatch."""
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from types import BuiltinFunctionType
+
+from ..core import nodefault
+from .policy import permits
+from .predicate import isclass
+
+
+# Attribute classifications, as recorded by the AttributeCache.
+
+PROTECTED = 'protected'  # Rejected by the protection rules or a policy; dispatch stops here.
+MISSING = 'missing'  # Not present on the class, and the class offers no dynamic fallback.
+CLASS = 'class'  # A nested class attribute, to be instantiated during descent.
+ATTRIBUTE = 'attribute'  # Some other static attribute, e.g. a method; retrieved using getattr.
+DYNAMIC = 'dynamic'  # Not statically known; the class provides __getattr__ or __getattribute__.
+
+
+def lookup_static(cls, name, default=nodefault):
+	"""Find the named attribute within a class hierarchy without invoking descriptors or metaclass attributes."""
+	
+	for base in cls.__mro__:
+		value = base.__dict__.get(name, nodefault)
+		
+		if value is not nodefault:
+			return value
+	
+	return default
+
+
+class LRUCache:
+	"""A bounded mapping which discards the least recently used entry once full.
+	
+	If a time to live, in seconds, is given, entries older than this are also discarded, when next accessed. Reads do
+	not acquire the lock; only insertion and eviction are serialized. Hit and miss counts are not synchronized, and may
+	slightly under-count under heavy concurrent use.
+	"""
+	
+	__slots__ = ('size', 'ttl', 'hits', 'misses', 'evictions', '_data', '_lock')
+	
+	def __init__(self, size=1024, ttl=None):
+		self.size = size
+		self.ttl = ttl
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self._data = OrderedDict()
+		self._lock = Lock()
+	
+	def __repr__(self):
+		return "{self.__class__.__name__}({count}/{self.size}, hits={self.hits}, misses={self.misses})".format(
+				self = self,
+				count = len(self._data),
+			)
+	
+	def __len__(self):
+		return len(self._data)
+	
+	def __contains__(self, key):
+		return key in self._data
+	
+	def get(self, key, default=None):
+		"""Retrieve a cached value, marking it as recently used, or return the default."""
+		
+		data = self._data
+		value = data.get(key, nodefault)
+		
+		if value is nodefault:
+			self.misses += 1
+			return default
+		
+		if self.ttl is not None:
+			value, expires = value
+			
+			if expires <= monotonic():
+				self.discard(key)
+				self.misses += 1
+				return default
+		
+		self.hits += 1
+		
+		try:
+			data.move_to_end(key)
+		except KeyError:  # Evicted by another thread between retrieval and promotion; the value is still good.
+			pass
+		
+		return value
+	
+	def set(self, key, value):
+		"""Store a value, evicting the least recently used entries if over capacity."""
+		
+		data = self._data
+		entry = value if self.ttl is None else (value, monotonic() + self.ttl)
+		
+		with self._lock:
+			data[key] = entry
+			data.move_to_end(key)
+			
+			while len(data) > self.size:
+				data.popitem(last=False)
+				self.evictions += 1
+		
+		return value
+	
+	def discard(self, key):
+		"""Remove the given key from the cache, if present."""
+		
+		with self._lock:
+			self._data.pop(key, None)
+	
+	def invalidate(self, predicate=None):
+		"""Discard the entries whose key satisfies the given predicate, or all entries if no predicate is given."""
+		
+		with self._lock:
+			if predicate is None:
+				self._data.clear()
+				return
+			
+			for key in [key for key in self._data if predicate(key)]:
+				del self._data[key]
+	
+	@property
+	def stats(self):
+		"""A snapshot of the current occupancy and effectiveness of this cache."""
+		
+		return {
+				'size': len(self._data),
+				'capacity': self.size,
+				'hits': self.hits,
+				'misses': self.misses,
+				'evictions': self.evictions,
+			}
+
+
+class AttributeCache(LRUCache):
+	"""Remember what kind of attribute a given path segment names on a given class.
+	
+	Entries are keyed by `(type, segment)` and record one of the classifications above, allowing repeated dispatch
+	through the same static structure to skip the protection and policy checks. Only classifications are cached;
+	attributes are always retrieved from the object itself, so instance attributes, the results of `__getattr__`, and
+	modifications of the class are observed exactly as they would be without this cache. Reloading a module produces
+	new classes, and thus new keys, leaving stale entries to age out.
+	
+	Once full, the oldest entries are evicted first. Unlike the other caches, entries are not promoted when used: hits
+	are the common case, and classifying an evicted entry again costs less than reordering on every hit would.
+	
+	Unless `missing` is true, the classifications of missing names are not retained, so that requests for many distinct
+	nonexistent paths do not evict useful entries. This is intended for use alongside a `NegativeCache`, which records
+	those misses separately.
+	"""
+	
+	__slots__ = ('protect', 'policy', 'missing')
+	
+	def __init__(self, size=1024, protect=True, policy=None, missing=True):
+		super(AttributeCache, self).__init__(size)
+		
+		self.protect = protect
+		self.policy = policy
+		self.missing = missing
+	
+	def classify(self, cls, name):
+		"""Determine the kind of attribute the given name represents on instances of the given class.
+		
+		Returns a `(kind, value)` tuple, where the value is the nested class itself for `CLASS` entries.
+		"""
+		
+		if self.protect and (name[0] == '_' or issubclass(cls, BuiltinFunctionType)):
+			return PROTECTED, None
+		
+		if not permits(cls, name, self.policy):  # Rejected by a declarative policy; treated as protected.
+			return PROTECTED, None
+		
+		if cls.__getattribute__ is not object.__getattribute__:  # Fully dynamic; nothing can be known in advance.
+			return DYNAMIC, None
+		
+		value = lookup_static(cls, name)
+		
+		if value is nodefault:
+			if lookup_static(cls, '__getattr__', None) is not None:
+				return DYNAMIC, None
+			
+			return MISSING, None
+		
+		if isclass(value):
+			return CLASS, value
+		
+		return ATTRIBUTE, None
+	
+	def _entry(self, cls, name):
+		"""Retrieve the classification of the given name on the given class, classifying and recording it if unknown.
+		
+		Unlike `get`, entries are not promoted when used; see the class documentation.
+		"""
+		
+		key = (cls, name)
+		entry = self._data.get(key)
+		
+		if entry is None:
+			self.misses += 1
+			entry = self.classify(cls, name)
+			
+			return self.set(key, entry) if self.missing or entry[0] is not MISSING else entry
+		
+		self.hits += 1
+		
+		return entry
+	
+	def nested(self, cls, name):
+		"""Retrieve the nested class the given name refers to on the given class itself, or `nodefault` if not a class."""
+		
+		kind, value = self._entry(cls, name)
+		
+		if kind is not CLASS:
+			return nodefault
+		
+		if getattr(cls, name, nodefault) is not value:  # The class has since been modified.
+			kind, value = self.set((cls, name), self.classify(cls, name))
+		
+		return value if kind is CLASS else nodefault
+	
+	def lookup(self, obj, name):
+		"""Retrieve the named attribute of the given object, utilizing a cached classification where possible.
+		
+		Returns a `(kind, value)` tuple; the value is `nodefault` for `PROTECTED` results, and for lookups which failed.
+		Only the classification is cached, sparing the protection and policy checks. The attribute itself is always
+		retrieved from the object, as it would be without this cache, so instance attributes and modifications of the
+		class are observed; the interpreter's own type attribute cache, invalidated whenever a class is modified, keeps
+		that retrieval inexpensive. Where the attribute found contradicts the classification, it is reported as an
+		`ATTRIBUTE`.
+		"""
+		
+		cls = type(obj)
+		key = (cls, name)
+		data = self._data
+		entry = data.get(key)
+		
+		if entry is None:
+			self.misses += 1
+			entry = self.classify(cls, name)
+			
+			if self.missing or entry[0] is not MISSING:
+				self.set(key, entry)
+		
+		else:  # Inlined from `_entry`, this being the path taken for every element of every cached dispatch.
+			self.hits += 1
+		
+		kind, expected = entry
+		
+		if kind is PROTECTED:
+			return kind, nodefault
+		
+		value = getattr(obj, name, nodefault)
+		
+		if (kind is CLASS and value is not expected) or (kind is MISSING and value is not nodefault):
+			return ATTRIBUTE, value  # Shadowed by an instance attribute, or the class has been modified.
+		
+		return kind, value
+
+
+class NegativeCache(LRUCache):
+	"""Remember which path segments name nothing on a given class, allowing repeated misses to skip attribute lookup.
+	
+	Entries are keyed by `(type, segment)`. Static misses, those of classes which neither define the attribute nor
+	implement `__getattr__` or `__getattribute__`, are remembered automatically. The misses of dynamic classes are only
+	remembered if the class opts in by declaring `__dispatch_negative__`, as `__getattr__` may later succeed for the same
+	name; consider giving a time to live, in seconds, if any do. Instance attributes always take precedence. Entries are
+	not revalidated against the class; invalidate the cache after adding attributes to a class at runtime.
+	
+	Hits count the lookups this cache answered, and misses those it recorded; lookups of attributes which exist are not
+	counted at all. As with the attribute cache, entries are not promoted when used.
+	"""
+	
+	__slots__ = ()
+	
+	def missing(self, obj, name):
+		"""Determine if the named attribute of the given object is known to be missing."""
+		
+		key = (type(obj), name)
+		entry = self._data.get(key)
+		
+		if entry is None:
+			return False
+		
+		if self.ttl is not None and entry[1] <= monotonic():
+			self.discard(key)
+			return False
+		
+		instance = getattr(obj, '__dict__', None)
+		
+		if instance and name in instance:
+			return False
+		
+		self.hits += 1
+		
+		return True
+	
+	def record(self, obj, name):
+		"""Remember that the named attribute of the given object was not found, if the miss may be remembered."""
+		
+		cls = type(obj)
+		
+		if getattr(cls, '__dispatch_negative__', False) or (
+				cls.__getattribute__ is object.__getattribute__ and
+				lookup_static(cls, name) is nodefault and
+				lookup_static(cls, '__getattr__', None) is None
+			):
+			self.misses += 1
+			self.set((cls, name), True)
+
+
+class PathCache(LRUCache):
+	"""Remember the static structure traversed by whole paths, allowing repeated dispatch to skip per-element lookups.
+	
+	Entries are keyed by `(root, elements)`, and record the nested classes instantiated along the path, with the crumb
+	paths committed between them; dispatch resumes normally from the last. Paths are only recorded if resolved entirely
+	from static structure: every element consumed names a nested class, other than the last, which may name any static
+	attribute, and none is resolved by `__getattr__` or `__getattribute__`, or crosses a class declaring
+	`__dispatch_cache__ = False`. Others are remembered as uncacheable, and dispatched as usual. Paths which descend
+	through no nested class, or end at a protected or missing element, are not recorded at all, as replaying them would
+	spare no work. Instances are never cached: each dispatch constructs its own, given the request context, and
+	attributes assigned to instances take precedence. Entries are not revalidated against the classes; invalidate the
+	cache after modifying them.
+	
+	Hits count dispatches served from a recorded structure, misses those analysed, and `bypassed` those of paths known
+	to be uncacheable.
+	"""
+	
+	__slots__ = ('bypassed', )
+	
+	def __init__(self, size=1024, ttl=None):
+		super(PathCache, self).__init__(size, ttl)
+		
+		self.bypassed = 0
+	
+	def structure(self, key):
+		"""Retrieve the recorded structure of the given path: a skeleton, False if uncacheable, or None if unknown."""
+		
+		entry = self.get(key)
+		
+		if entry is False:  # Only dispatches served from a recorded structure are counted as hits.
+			self.hits -= 1
+			self.bypassed += 1
+		
+		return entry
+	
+	def record(self, key, skeleton):
+		"""Record the structure of the given path, or that it is uncacheable, if None; returns the entry recorded."""
+		
+		return self.set(key, False if skeleton is None else skeleton)
+	
+	@property
+	def stats(self):
+		"""A snapshot of the current occupancy and effectiveness of this cache, including its hit rate."""
+		
+		stats = super(PathCache, self).stats
+		total = self.hits + self.misses + self.bypassed
+		
+		stats['bypassed'] = self.bypassed
+		stats['rate'] = self.hits / total if total else 0.0
+		
+		return stats
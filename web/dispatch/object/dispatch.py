@@ -1,39 +1,176 @@
-from inspect import isclass, ismethod, isbuiltin, isroutine, getmembers, signature
+import gc
 
-from ..core import Crumb, nodefault, ipeek, prepare_path, opts
+from collections import deque, namedtuple
+from time import perf_counter
 
-if __debug__:
-	log = __import__('logging').getLogger(__name__)
+from ..core import Crumb, nodefault
+from .cache import PROTECTED, MISSING, CLASS, ATTRIBUTE, DYNAMIC, AttributeCache, NegativeCache, PathCache, lookup_static
+from .event import EVENTS
+from .meta import metadata, prime
+from .path import split, extent
+from .policy import permits
+from .predicate import isclass, isbuiltin
+
+
+Resolution = namedtuple('Resolution', ('handler', 'endpoint', 'options', 'path', 'remaining'))
+Resolution.__doc__ = """The final outcome of dispatch: the deepest object found, if it is an endpoint, and any unconsumed path."""
+
+
+def elapsed(started):
+	"""The time, in seconds, elapsed since the given `perf_counter` value, or None if timing had not been started."""
+	
+	return None if started is None else perf_counter() - started
 
 
 class ObjectDispatch:
 	"""Dispatch simulating the use of classes as collections, and attributes as resources.
 	
 	Underscore-prefixed attribute names are protected by default, though these protections can be explicitly disabled.
+	Further restrictions may be declared as a `Policy`, given here to apply to all classes, or declared by individual
+	classes as `__dispatch_policy__`; path elements rejected by a policy are treated as protected. See `policy`.
+	
+	If a cache size is given, the kind of attribute each path segment names on each class encountered is remembered,
+	allowing repeated dispatch through static structures to skip most reflective checks. See `AttributeCache`. The
+	cache may be populated in advance from a `RouteTable` given as `routes`, growing the cache to fit, if needed.
+	
+	If a `negative` cache size, or `NegativeCache` instance, is given, segments found to name nothing on a class are
+	remembered, so that repeated requests for them, such as those of vulnerability scanners, skip attribute lookup.
+	
+	If a `paths` cache size, or `PathCache` instance, is given, the nested classes traversed by each whole path resolved
+	from static structure are remembered, so that repeated dispatch of the same path, from the same root class, only
+	instantiates them. It is not consulted while listeners are attached, nor by lazy or asynchronous dispatch.
+	
+	Progress may be observed by attaching listeners; see `listen` and the `event` module.
+	
+	If `static` is truthy, trace enumerates attributes without evaluating properties or other descriptors, utilizing
+	cached per-class analysis. See the `introspect` module.
 	
+	Classes are normally instantiated each time they are encountered. A class may instead declare that its instances
+	are reusable by assigning `__dispatch_reuse__`: a value of `'process'` shares a single instance, constructed without
+	arguments, for the life of the dispatcher; `'context'` shares one instance per context, retained by the context
+	itself as its `_dispatch_instances` attribute.
 	
+	If `lazy` is truthy, a class is not instantiated if the next path element names a class nested within it; the nested
+	class is retrieved from the class itself, and the class, not an instance, is the handler of that step. Classes are
+	instantiated only where an attribute can not be resolved this way, or at the end of the path. Classes which assign
+	instance attributes shadowing nested classes must not be dispatched lazily. Batch dispatch is always eager.
+	
+	A single dispatcher may be used by any number of threads at once. Dispatch state is local to each call; the shared
+	caches are read without locking, and listeners are replaced, never mutated, when attached or detached. Reusable
+	instances may, rarely, be constructed more than once by competing threads; only one is retained and returned.
 	"""
 	
-	__slots__ = ['protect']
+	__slots__ = ['protect', 'policy', 'cache', 'negative', 'paths', 'hooks', 'static', 'lazy', '_shared']
 	
-	def __init__(self, protect=True):
+	def __init__(self, protect=True, cache=0, listeners=(), static=False, routes=None, policy=None, negative=0,
+			lazy=False, paths=0):
 		self.protect = protect
+		self.policy = policy
+		self.static = static
+		self.lazy = lazy
+		self.negative = negative if isinstance(negative, NegativeCache) else (NegativeCache(negative) if negative else None)
+		self.paths = (PathCache(paths) if paths else None) if isinstance(paths, int) else paths
+		
+		if routes is not None:  # The cache must be at least large enough to hold the precompiled table.
+			cache = max(cache, len(routes))
+		
+		self.cache = AttributeCache(cache, protect, policy, self.negative is None) if cache else None
+		
+		if routes:
+			routes.install(self.cache)
+		
+		self.hooks = None  # Populated with a mapping of event name to tuple of listeners only if any are attached.
+		self._shared = {}  # Reusable instances, keyed by class.
 		
-		if __debug__:
-			log.debug("Object dispatcher prepared.", extra=dict(dispatcher=repr(self)))
+		for listener in listeners:
+			self.listen(listener)
 		
 		super(ObjectDispatch, self).__init__()
 	
 	def __repr__(self):
-		return "ObjectDispatch(0x{id}, protect={self.protect!r})".format(id=id(self), self=self)
+		return "ObjectDispatch(0x{id}, protect={self.protect!r}, cache={cache})".format(
+				id = id(self),
+				self = self,
+				cache = self.cache.size if self.cache else 0,
+			)
+	
+	def listen(self, listener, *events):
+		"""Attach a listener to the given events, or to all events if none are named.
+		
+		Returns the listener, allowing use as a decorator if no specific events are desired.
+		"""
+		
+		for event in events:
+			if event not in EVENTS:
+				raise ValueError("Unknown dispatch event: " + repr(event))
+		
+		hooks = dict(self.hooks or ())  # Copied, then replaced, so that dispatch in progress is not disturbed.
+		
+		for event in events or EVENTS:
+			hooks[event] = hooks.get(event, ()) + (listener, )
+		
+		self.hooks = hooks
+		return listener
+	
+	def forget(self, listener):
+		"""Detach the given listener from all events."""
+		
+		hooks = {event: tuple(i for i in listeners if i is not listener) for event, listeners in (self.hooks or {}).items()}
+		self.hooks = {event: listeners for event, listeners in hooks.items() if listeners} or None
+	
+	def _emit(self, event, context, **data):
+		hooks = self.hooks  # May have been detached by another thread since the caller checked.
+		
+		for listener in hooks.get(event, ()) if hooks else ():
+			listener(self, event, context, **data)
+	
+	def _pool(self, cls, context):
+		"""Retrieve the dictionary retaining reusable instances of the given class, or None if there is nothing to scope
+		reuse to."""
+		
+		scope = cls.__dispatch_reuse__
+		
+		if scope == 'process':
+			return self._shared
+		
+		if scope != 'context':
+			raise ValueError("Unknown reuse scope for {!r}: {!r}".format(cls, scope))
+		
+		try:  # Retained by the context itself; instances commonly reference their context, preventing weak reference.
+			return vars(context).setdefault('_dispatch_instances', {})
+		except TypeError:  # The context has no attribute dictionary, e.g. None.
+			return None
+	
+	def _reuse(self, cls, context):
+		"""Retrieve, or construct and retain, a reusable instance of the given class."""
+		
+		pool = self._pool(cls, context)
+		
+		if pool is None:
+			return cls() if context is None else cls(context)
+		
+		instance = pool.get(cls)
+		
+		if instance is None:  # Instances shared by the process are constructed without context.
+			instance = pool.setdefault(cls, cls() if context is None or pool is self._shared else cls(context))
+		
+		return instance
 	
 	def trace(self, context, obj):
 		"""Enumerate the children of the given object, as would be accessible through dispatch."""
 		
+		from inspect import ismethod, isroutine, getmembers, signature  # Deferred until required; see `predicate`.
+		
 		if isroutine(obj):
-			yield Crumb(self, obj, endpoint=True, handler=obj, options=opts(obj))
+			yield Crumb(self, obj, endpoint=True, handler=obj, options=metadata(obj).options)
+			return
+		
+		if self.static:
+			yield from self._trace_static(obj)
 			return
 		
+		owner = obj if isclass(obj) else type(obj)
+		
 		for name, attr in getmembers(obj):
 			if name == '__getattr__':
 				sig = signature(attr)
@@ -46,7 +183,7 @@ class ObjectDispatch:
 				
 				if reta is not sig.empty:
 					if callable(reta) and not isclass(reta):
-						yield Crumb(self, obj, path, endpoint=True, handler=reta, options=opts(reta))
+						yield Crumb(self, obj, path, endpoint=True, handler=reta, options=metadata(reta).options)
 					else:
 						yield Crumb(self, obj, path, handler=reta)
 				
@@ -60,79 +197,404 @@ class ObjectDispatch:
 				yield Crumb(self, obj, None, endpoint=True, handler=obj)
 				continue
 			
-			if self.protect and name[0] == '_':
+			if self.protect and name[0] == '_' or not permits(owner, name, self.policy):
 				continue
 			
 			yield Crumb(self, obj, name,
-					endpoint=callable(attr) and not isclass(attr), handler=attr, options=opts(attr))
+					endpoint=callable(attr) and not isclass(attr), handler=attr, options=metadata(attr).options)
 	
-	def __call__(self, context, obj, path):
+	def _trace_static(self, obj):
+		"""Enumerate children using the cached, non-evaluating analysis of the object's class."""
+		
+		from .introspect import SELF, describe, describe_instance
+		
 		protect = self.protect
-		origin = obj
-		current = None
+		policy = self.policy
+		instance = not isclass(obj)
+		owner = type(obj) if instance else obj
+		new = tuple.__new__  # Members are pre-processed; we bypass the conversions performed by Crumb.__new__.
 		
-		if __debug__:
-			LE = {'dispatcher': repr(self), 'context': getattr(context, 'id', id(context))}
-			log.debug("Preparing object dispatch.", extra=dict(LE, obj=obj, path=path))
+		for name, path, handler, bind, endpoint, options, bound in (describe_instance(obj, protect) if instance else describe(obj)):
+			if handler is SELF:
+				handler = obj
+			
+			elif name != '__getattr__' and (protect and name[0] == '_' or not permits(owner, name, policy)):
+				continue
+			
+			elif instance and bind:
+				handler = handler.__get__(obj)
+				options = bound
+			
+			yield new(Crumb, (self, obj, path, endpoint, handler, options))
+	
+	def _instantiate(self, cls, context, terminus=False):
+		"""Instantiate a class encountered during dispatch, or reuse an existing instance, if the class permits."""
 		
-		path = prepare_path(path)
+		started = perf_counter() if self.hooks else None
 		
-		for previous, current in ipeek(path):  # Things can get hairy, so we need to track both this and the previous.
-			if isclass(obj):  # We instantiate classes we encounter during dispatch.
-				obj = obj() if context is None else obj(context)
+		if getattr(cls, '__dispatch_reuse__', None):
+			obj = self._reuse(cls, context)
+		else:
+			obj = cls() if context is None else cls(context)
+		
+		if self.hooks:
+			self._emit('instantiate', context, handler=obj, terminus=terminus, duration=elapsed(started))
+		
+		return obj
+	
+	def _retrieve(self, context, obj, name):
+		"""Retrieve the named attribute of the given object, returning `nodefault` if protected or not found."""
+		
+		cache = self.cache
+		negative = self.negative
+		started = perf_counter() if self.hooks else None
+		
+		if negative is not None and negative.missing(obj, name):  # Only ever recorded for unprotected names.
+			if self.hooks:
+				self._emit('miss', context, handler=obj, segment=name, duration=elapsed(started))
+			
+			return nodefault
+		
+		if cache is not None:  # Utilize, or populate, the cached classification of this attribute.
+			kind, new = (PROTECTED, nodefault) if self.protect and name[0] == '_' else cache.lookup(obj, name)
+			
+			if kind is PROTECTED:
+				if self.hooks:
+					self._emit('protected', context, handler=obj, segment=name)
 				
-				if __debug__:
-					log.debug("Instantiated class during descent.", extra=dict(LE, obj=obj))
+				return nodefault
+		
+		else:
+			if self.protect and (name[0] == '_' or isbuiltin(obj)) or not permits(type(obj), name, self.policy):
+				if self.hooks:
+					self._emit('protected', context, handler=obj, segment=name)
 				
-				yield Crumb(self, origin, handler=obj)
+				return nodefault
 			
-			if protect:
-				if current[0] == '_' or isbuiltin(obj):
-					if __debug__:
-						log.debug("Attempt made to access a protected attribute: " + current, extra=dict(LE,
-								handler = obj,
-								current = current,
-							))
-					break  # Not being popped, this value will remain in the path.
+			new = getattr(obj, name, nodefault)  # Attempt to get this attribute. Triggers __getattr__.
+		
+		if new is nodefault:
+			if negative is not None:
+				negative.record(obj, name)
 			
-			new = getattr(obj, current, nodefault)  # Attempt to get this attribute. Triggers __getattr__.
+			if self.hooks:
+				self._emit('miss', context, handler=obj, segment=name, duration=elapsed(started))
+		
+		return new
+	
+	def _nested(self, context, cls, name):
+		"""Retrieve a class nested within the given class without instantiating it, or return `nodefault`."""
+		
+		cache = self.cache
+		started = perf_counter() if self.hooks else None
+		
+		if cache is not None:
+			new = cache.nested(cls, name)
+		
+		elif self.protect and name[0] == '_' or cls.__getattribute__ is not object.__getattribute__ or \
+				not permits(cls, name, self.policy):
+			return nodefault
+		
+		else:
+			new = lookup_static(cls, name)
 			
-			if new is nodefault:  # We failed to find this attribute.
-				break  # The current part, like with protected attributes, will be preserved in the path.
+			if not isclass(new):
+				return nodefault
+		
+		if self.hooks and new is not nodefault:
+			self._emit('descend', context, parent=cls, segment=name, handler=new, duration=elapsed(started))
+		
+		return new
+	
+	def _attribute(self, context, obj, name):
+		"""Retrieve the named attribute of the given object for descent, returning `nodefault` if unavailable."""
+		
+		started = perf_counter() if self.hooks else None
+		new = self._retrieve(context, obj, name)
+		
+		if self.hooks and new is not nodefault:
+			self._emit('descend', context, parent=obj, segment=name, handler=new, duration=elapsed(started))
+		
+		return new
+	
+	def _structure(self, root, path, end):
+		"""Retrieve the skeleton of the given path from the path cache, analysing it if unknown, or None if uncacheable."""
+		
+		paths = self.paths
+		key = (root, tuple(path[:end]))
+		skeleton = paths.structure(key)
+		
+		if skeleton is None:
+			skeleton = self._analyse(root, path, end)
 			
-			if __debug__:
-				log.debug("Retrieved attribute: " + current, extra=dict(LE, obj=new))
+			if skeleton == ():  # Not worth remembering; dispatched as usual, without displacing other entries.
+				return None
+			
+			skeleton = paths.record(key, skeleton)
+		
+		return skeleton or None
+	
+	def _analyse(self, root, path, end):
+		"""Determine the nested classes traversed by the given path, returning None if not resolved statically.
+		
+		The skeleton is a tuple of `(cls, crumb path)` pairs, one per class instantiated and committed during descent,
+		and the class dispatch resumes from. An empty tuple is returned for paths whose skeleton would spare no work,
+		descending through no nested class, or which end at a protected or missing element, e.g. the requests of
+		vulnerability scanners; were these recorded, floods of them would evict useful entries.
+		"""
+		
+		classify = (self.cache if self.cache is not None else AttributeCache(0, self.protect, self.policy)).classify
+		steps = []
+		cls = root
+		previous = None
+		
+		for index in range(end):
+			if not getattr(cls, '__dispatch_cache__', True):
+				return None
+			
+			current = path[index]
+			kind, value = classify(cls, current)
+			
+			if kind is DYNAMIC or (kind is ATTRIBUTE and index + 1 < end):  # Beyond the reach of static analysis.
+				return None
+			
+			if kind is PROTECTED or kind is MISSING:
+				return ()
+			
+			if kind is not CLASS:  # Resolved by the final step.
+				break
+			
+			steps.append((cls, Crumb.Path(previous) if previous else None))
+			previous = current
+			cls = value
+		
+		if not getattr(cls, '__dispatch_cache__', True):
+			return None
+		
+		return (tuple(steps), cls) if steps else ()
+	
+	def _replay(self, context, origin, path, end, skeleton):
+		"""Dispatch along a path whose structure is known, instantiating each class, then resuming from the last."""
+		
+		new = tuple.__new__  # Crumb paths are prepared in advance; we bypass the conversions performed by Crumb.__new__.
+		previous = None
+		
+		for index, (cls, step) in enumerate(skeleton[0]):
+			obj = self._instantiate(cls, context)
+			yield new(Crumb, (self, origin, None, False, obj, None))
+			current = path[index]
+			attributes = getattr(obj, '__dict__', None)
+			
+			if attributes and current in attributes:  # Shadowed by an instance attribute; resolve it normally.
+				yield from self._descend(context, origin, obj, path, index, end, previous, current)
+				return
+			
+			yield new(Crumb, (self, origin, step, False, obj, None))
+			previous = current
+		
+		yield from self._descend(context, origin, skeleton[1], path, len(skeleton[0]), end, previous, previous)
+	
+	def __call__(self, context, obj, path):
+		started = perf_counter() if self.hooks else None
+		path = split(path)  # Lists and tuples are walked in place, by index; they are not consumed.
+		end = extent(path)
+		
+		if self.paths is not None and not (self.hooks or self.lazy) and isclass(obj):
+			skeleton = self._structure(obj, path, end)
+			
+			if skeleton is not None:
+				return self._replay(context, obj, path, end, skeleton)
+		
+		return self._descend(context, obj, obj, path, 0, end, None, None, started)
+	
+	def _descend(self, context, origin, obj, path, index, end, previous, current, started=None):
+		"""Continue iterative dispatch from the given object, positioned at the given index within the path.
+		
+		The object is that reached by consuming the path up to the index, `previous` and `current` being the elements
+		preceding it, or None. Used by `__call__`, beginning at the origin, and by specialized resolvers, which resume
+		generic dispatch from wherever the structure they were generated from ends.
+		"""
+		
+		lazy = self.lazy
+		
+		while index < end:  # Things can get hairy, so we need to track both this and the previous.
+			current = path[index]
+			new = self._nested(context, obj, current) if lazy and isclass(obj) else nodefault
+			
+			if new is nodefault:
+				if isclass(obj):  # We instantiate classes we encounter during dispatch.
+					obj = self._instantiate(obj, context)
+					yield Crumb(self, origin, handler=obj)
+				
+				new = self._attribute(context, obj, current)
+			
+			if new is nodefault:  # We failed to find this attribute, or it was protected.
+				break  # Not being popped, the current part will be preserved in the path.
 			
 			# Commit the previously walked step.
 			yield Crumb(self, origin, path=previous, handler=obj)
 			
+			previous = current
+			index += 1
 			obj = new  # Continue processing the next level of path from this point.
 		
 		else:  # No path left to consume. Wherever we go, there we are. This handles the "empty path" case.
 			if isclass(obj) and getattr(obj, '__dispatch__', 'object') == 'object':  # We instantiate classes we encounter during dispatch.
-				obj = obj() if context is None else obj(context)
-				
-				if __debug__:
-					log.debug("Instantiated class at path terminus.", extra=dict(LE, obj=obj))
+				obj = self._instantiate(obj, context, True)
 			
-			if __debug__:
-				log.debug("Dispatch complete due to exhausted path.", extra=dict(LE, obj=obj))
+			endpoint = metadata(obj).endpoint
 			
-			yield Crumb(self, origin, path=current, endpoint=callable(obj) and not hasattr(obj, '__dispatch__'), handler=obj)
+			if self.hooks:
+				self._emit('terminus', context, handler=obj, endpoint=endpoint, segment=None, path=tuple(path[:end]),
+						duration=elapsed(started))
+			
+			yield Crumb(self, origin, path=current, endpoint=endpoint, handler=obj)
 			return
 		
 		# We bailed, so "obj" represents the last found attribute, "previous" is the path element matching that
 		# object, and "current" represents the failed element. Because we bailed, "current" remains in the path.
 		
-		if __debug__:
-			log.debug("Dispatch interrupted attempting to resolve attribute: " + current, extra=dict(LE,
-					handler = repr(obj),
-					endpoint = callable(obj),
-					previous = previous,
-					attribute = current,
-				))
+		meta = metadata(obj)  # We don't reeeeeally care what type of callable, here...
+		endpoint = meta.partial
+		
+		if self.hooks:
+			self._emit('terminus', context, handler=obj, endpoint=endpoint, segment=current, path=tuple(path[:index]),
+					duration=elapsed(started))
+		
+		yield Crumb(self, origin, path=previous, endpoint=endpoint, handler=obj, options=meta.options)
+	
+	def warm(self, root, freeze=True):
+		"""Precompute the dispatch metadata of the static structure beneath the given root, returning its `RouteTable`.
+		
+		Intended to be called by the master process of a pre-forking server prior to forking its workers. The attribute
+		cache, if enabled, is populated, as is the endpoint metadata of every method found, and the static trace analysis
+		of every class found, if in use. If `freeze` is truthy, all objects then alive are moved beyond the reach of the
+		garbage collector, using `gc.freeze`, so that collection within workers does not touch, and thereby copy, the
+		memory pages shared with the master.
+		"""
+		
+		from .introspect import describe
+		from .table import RouteTable
+		
+		table = RouteTable.compile(root, self.protect)
+		
+		if self.cache is not None:
+			table.install(self.cache)
+		
+		for (cls, name), (kind, value) in table.entries.items():
+			prime(value if kind is CLASS else lookup_static(cls, name, None))  # Attribute values are not retained.
+			
+			if self.static and kind is CLASS:
+				describe(value)
+		
+		if self.static:
+			describe(root if isclass(root) else type(root))
+		
+		if freeze and hasattr(gc, 'freeze'):  # Python 3.7 and later.
+			gc.collect()
+			gc.freeze()
+		
+		return table
+	
+	def batch(self, context, obj, paths):
+		"""Dispatch each of the given paths from the same root, returning a list of the crumbs produced for each.
+		
+		Paths are arranged into a prefix tree so that shared prefixes are walked, and classes along them instantiated,
+		only once. See the `batch` module.
+		"""
+		
+		from .batch import batch
+		
+		return batch(self, context, obj, paths)
+	
+	def walk(self, context, obj, depth=None, limit=None):
+		"""Recursively and lazily enumerate every route reachable from the given object, as `Route` tuples.
+		
+		Classes are descended into without instantiation; self-referencing structures are detected and not revisited.
+		Enumeration may be limited by `depth` and total `limit`. See the `walk` module.
+		"""
+		
+		from .walk import walk
+		
+		return walk(self, context, obj, depth, limit)
+	
+	def specialize(self, root, depth=16, limit=1000):
+		"""Generate a resolver for the given root class, specialized to its static structure, as a `Resolver`.
+		
+		Called with a context and path, it produces the same crumbs as calling this dispatcher with the root would. The
+		structure is captured when generated; see the `specialize` module.
+		"""
+		
+		from .specialize import specialize
+		
+		return specialize(self, root, depth, limit)
+	
+	def resolve(self, context, obj, path):
+		"""Resolve the given path, returning only the final outcome of dispatch as a `Resolution`.
+		
+		The result is equivalent to the final crumb produced by calling the dispatcher, with the unconsumed path elements
+		available as `remaining`, but no intermediate crumbs are constructed.
+		"""
+		
+		lazy = self.lazy
+		previous = None
+		started = perf_counter() if self.hooks else None
+		path = split(path)
+		end = extent(path)  # Trailing separators are ignored, as during iterative dispatch.
+		index = 0
+		
+		if self.paths is not None and not (self.hooks or lazy) and isclass(obj):
+			skeleton = self._structure(obj, path, end)
+			
+			if skeleton is not None:  # Instantiate the classes along the path, resuming from the last.
+				for cls, step in skeleton[0]:
+					new = self._instantiate(cls, context)
+					attributes = getattr(new, '__dict__', None)
+					
+					if attributes and path[index] in attributes:  # Shadowed by an instance attribute.
+						obj = new
+						break
+					
+					previous = path[index]
+					index += 1
+				
+				else:
+					obj = skeleton[1]
+		
+		while index < end:
+			current = path[index]
+			new = self._nested(context, obj, current) if lazy and isclass(obj) else nodefault
+			
+			if new is nodefault:
+				if isclass(obj):
+					obj = self._instantiate(obj, context)
+				
+				new = self._attribute(context, obj, current)
+			
+			if new is nodefault:
+				break
+			
+			previous = current
+			index += 1
+			obj = new
 		
-		if callable(obj) and not getattr(obj, '__dispatch__', None):  # We don't reeeeeally care what type of callable, here...
-			yield Crumb(self, origin, path=previous, endpoint=True, handler=obj, options=opts(obj))
 		else:
-			yield Crumb(self, origin, path=previous, endpoint=False, handler=obj, options=opts(obj))
+			if isclass(obj) and getattr(obj, '__dispatch__', 'object') == 'object':
+				obj = self._instantiate(obj, context, True)
+			
+			endpoint = metadata(obj).endpoint
+			
+			if self.hooks:
+				self._emit('terminus', context, handler=obj, endpoint=endpoint, segment=None, path=tuple(path[:end]),
+						duration=elapsed(started))
+			
+			return Resolution(obj, endpoint, None, previous, deque())
+		
+		meta = metadata(obj)
+		endpoint = meta.partial
+		
+		if self.hooks:
+			self._emit('terminus', context, handler=obj, endpoint=endpoint, segment=current, path=tuple(path[:index]),
+					duration=elapsed(started))
+		
+		return Resolution(obj, endpoint, meta.options, previous, deque(path[index:end]))
@@ -0,0 +1,40 @@
+"""Structured dispatch events, and a listener reproducing the historical diagnostic logging.
+
+Listeners are callables accepting the dispatcher, the event name, and the request context, plus event-specific keyword
+arguments. They are attached using `ObjectDispatch.listen`, and are only ever invoked if attached; a dispatcher with no
+listeners performs no event-related work at all.
+
+The events, and the keyword arguments they receive, are:
+
+* `instantiate` — a class was instantiated; `handler` is the new instance, `terminus` indicates if at the path's end.
+* `descend` — an attribute was retrieved; `parent` is the object it was retrieved from, `segment` the path element,
+  and `handler` the retrieved value.
+* `protected` — access to a protected attribute, or one rejected by a policy, was denied; `handler` is the object,
+  `segment` the path element.
+* `miss` — an attribute could not be found; `handler` is the object searched, `segment` the path element.
+* `terminus` — dispatch concluded; `handler` is the final object, `endpoint` indicates if it is an endpoint,
+  `segment` is the unconsumed path element which interrupted dispatch, if any, and `path` a tuple of the elements
+  consumed.
+
+The `instantiate`, `descend`, `miss`, and `terminus` events additionally receive a `duration`: the time, in seconds,
+spent constructing the instance, retrieving the attribute, failing to find it, or, for `terminus`, dispatching the
+whole path. Iterative dispatch includes the time spent by its consumer between steps. It is None where no time was
+measured, such as when the listener was attached mid-dispatch, or for paths dispatched together as a batch.
+"""
+
+EVENTS = ('instantiate', 'descend', 'protected', 'miss', 'terminus')
+
+
+def log(dispatcher, event, context, **data):
+	"""Emit each dispatch event as a DEBUG-level message using the standard logging framework."""
+	
+	logger = __import__('logging').getLogger('web.dispatch.object')
+	
+	if not logger.isEnabledFor(10):  # logging.DEBUG
+		return
+	
+	logger.debug("Object dispatch event: " + event, extra=dict(
+			data,
+			dispatcher = repr(dispatcher),
+			context = getattr(context, 'id', id(context)),
+		))
@@ -0,0 +1,143 @@
+"""Static, cached introspection of controller classes.
+
+Where `inspect.getmembers` retrieves every attribute through `getattr`, evaluating properties and other descriptors,
+the functions here consult class dictionaries directly. The results of this analysis, including that of `__getattr__`
+signatures and return annotations, are cached per class, weakly; classes which are garbage collected, e.g. after a
+module reload, are forgotten automatically. Explicitly `invalidate` a class after mutating it at runtime.
+"""
+
+from inspect import isclass, signature
+from types import FunctionType, BuiltinFunctionType
+from weakref import WeakKeyDictionary
+
+from ..core import Crumb, opts
+
+
+SELF = object()  # Placeholder for the object being traced, as the handler of an instance __call__ endpoint.
+
+_descriptions = WeakKeyDictionary()
+_builtins = {}  # Options of members implemented in C, such as those every class inherits from object; never collected.
+_native = (BuiltinFunctionType, type(object.__init__), type(str.join))  # The latter are not named by `types` until 3.7.
+
+
+def members(cls):
+	"""Return the sorted (name, value) pairs of all attributes defined within the class hierarchy, without evaluation."""
+	
+	found = {}
+	
+	for base in reversed(cls.__mro__):
+		found.update(base.__dict__)
+	
+	return sorted(found.items())
+
+
+def dynamic(cls, attr):
+	"""Analyse the given `__getattr__` function, returning the path placeholder and return annotation, if any."""
+	
+	sig = signature(attr)
+	parameters = list(sig.parameters.keys())
+	
+	return '{' + parameters[1 if len(parameters) > 1 else 0] + '}', sig.return_annotation, sig.empty
+
+
+def _options(value):
+	native = isinstance(value, _native)
+	
+	if native and value in _builtins:
+		return _builtins[value]
+	
+	try:
+		options = opts(value)
+	except (TypeError, ValueError):  # Some built-ins offer no signature to inspect.
+		options = None
+	
+	options = frozenset(options) if options else None
+	
+	if native:
+		_builtins[value] = options
+	
+	return options
+
+
+def _describe(cls, name, value):
+	"""Produce the cached description of a single member; see `describe`."""
+	
+	if isinstance(value, staticmethod):
+		value = value.__func__
+	
+	elif isinstance(value, classmethod):
+		value = value.__get__(None, cls)
+	
+	if name == '__getattr__':
+		path, reta, empty = dynamic(cls, value)
+		path = Crumb.Path(path)
+		
+		if reta is empty:
+			bind = isinstance(value, FunctionType)
+			return (name, path, value, bind, False, None, None)
+		
+		if callable(reta) and not isclass(reta):
+			options = _options(reta)
+			return (name, path, reta, False, True, options, options)
+		
+		return (name, path, reta, False, False, None, None)
+	
+	if name == '__call__':
+		return (name, None, SELF, False, True, None, None)
+	
+	bind = isinstance(value, FunctionType)
+	endpoint = callable(value) and not isclass(value)
+	options = _options(value)
+	
+	return (name, Crumb.Path(name), value, bind, endpoint, options, _options(value.__get__(SELF, cls)) if bind else options)
+
+
+def describe(cls):
+	"""Describe the members of the given class as they would be enumerated by trace, without evaluating descriptors.
+	
+	Returns a tuple of `(name, path, handler, bind, endpoint, options, bound)` tuples, where `bind` indicates that the
+	handler must be bound to an instance before use, and `bound` are the options applicable after having done so. The
+	handler of an instance's `__call__` endpoint is `SELF`; substitute the object being traced.
+	"""
+	
+	try:
+		return _descriptions[cls]
+	except KeyError:
+		pass
+	
+	result = _descriptions[cls] = tuple(_describe(cls, name, value) for name, value in members(cls))
+	return result
+
+
+def describe_instance(obj, protect=True):
+	"""Describe the members of the given instance, merging those of its class with any instance attributes.
+	
+	Instance attributes are not cached, as they may change at any time. Protected names are omitted, if requested.
+	"""
+	
+	cls = type(obj)
+	result = describe(cls)
+	attributes = getattr(obj, '__dict__', None)
+	
+	if attributes:
+		attributes = [(name, value) for name, value in attributes.items() if not protect or name[0] != '_']
+	
+	if not attributes:
+		return result
+	
+	result = {entry[0]: entry for entry in result}
+	
+	for name, value in attributes:
+		entry = _describe(cls, name, value)
+		result[name] = entry[:3] + (False, ) + entry[4:6] + entry[5:6]  # Instance attributes are never bound.
+	
+	return tuple(entry for name, entry in sorted(result.items()))
+
+
+def invalidate(cls=None):
+	"""Forget the cached description of the given class, or of all classes."""
+	
+	if cls is None:
+		_descriptions.clear()
+	else:
+		_descriptions.pop(cls, None)
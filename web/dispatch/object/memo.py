@@ -0,0 +1,67 @@
+"""Memoization of dynamically generated attributes, i.e. those produced by `__getattr__`."""
+
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from ..core import nodefault
+from .cache import LRUCache
+
+
+def memoize(size=1024, ttl=None, key=None):
+	"""Decorate a `__getattr__` method, remembering the values it produces.
+	
+	Values are remembered by attribute name, and shared by all instances of the class, within a bounded LRU cache of
+	the given size; if a time to live is given, in seconds, values older than this are looked up again. Where the value
+	depends on the instance, provide a `key` callable accepting the instance and attribute name and returning a hashable
+	value to remember the result by. Failed lookups, i.e. those raising `AttributeError`, are not remembered.
+	
+	The decorated method is given a `cache` attribute, the `LRUCache` instance, exposing hit and miss counts, and an
+	`invalidate` method, accepting a key to forget, or forgetting everything if called without one:
+		
+		class People:
+			@memoize(size=4096, ttl=60)
+			def __getattr__(self, username) -> Person:
+				return Person.load(username)
+		
+		People.__getattr__.invalidate('alice')
+	
+	Coroutine methods, as used with asynchronous dispatch, are supported; the awaited result is remembered.
+	"""
+	
+	def decorator(fn):
+		cache = LRUCache(size, ttl)
+		
+		if iscoroutinefunction(fn):
+			@wraps(fn)
+			async def __getattr__(self, name):
+				identifier = name if key is None else key(self, name)
+				value = cache.get(identifier, nodefault)
+				
+				if value is nodefault:
+					value = cache.set(identifier, await fn(self, name))
+				
+				return value
+		
+		else:
+			@wraps(fn)
+			def __getattr__(self, name):
+				identifier = name if key is None else key(self, name)
+				value = cache.get(identifier, nodefault)
+				
+				if value is nodefault:
+					value = cache.set(identifier, fn(self, name))
+				
+				return value
+		
+		def invalidate(identifier=nodefault):
+			if identifier is nodefault:
+				cache.invalidate()
+			else:
+				cache.discard(identifier)
+		
+		__getattr__.cache = cache
+		__getattr__.invalidate = invalidate
+		
+		return __getattr__
+	
+	return decorator
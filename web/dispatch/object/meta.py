@@ -0,0 +1,164 @@
+"""Cached metadata of the objects dispatch concludes at: if each is an endpoint, and the HTTP methods it accepts.
+
+Determining these involves `opts`, and thus signature inspection, plus attribute lookups, yet for a given function or
+class the answer never changes. The metadata of functions and classes is remembered, weakly, by identity; that of bound
+methods by their underlying function, as it does not depend on the instance bound to; and that of ordinary instances
+by their class. Other callable objects, such as functions implemented in C or partials, each have their own signature,
+and are analysed every time. A redefined function or class is a new object, and is analysed anew when first seen; the
+metadata of the old one is discarded along with it. Explicitly `invalidate` an object after mutating it at runtime,
+e.g. assigning a new `__options__` or `__dispatch__` attribute.
+"""
+
+from collections import namedtuple
+from types import FunctionType, MethodType
+from weakref import WeakKeyDictionary
+
+from ..core import nodefault, opts
+from .cache import lookup_static
+from .predicate import isclass
+
+
+Metadata = namedtuple('Metadata', ('endpoint', 'partial', 'options'))
+Metadata.__doc__ = """If an object is an endpoint where the path is exhausted, if it is where dispatch is interrupted
+with path remaining, and the frozen set of HTTP methods it accepts, or None."""
+
+_objects = WeakKeyDictionary()  # Functions and classes, by identity.
+_bound = WeakKeyDictionary()  # Bound methods, by underlying function.
+_instances = WeakKeyDictionary()  # Instances, by class.
+
+
+def _attribute(obj, name):
+	"""Retrieve the named attribute of an instance from its own dictionary or its class, never invoking `__getattr__`."""
+	
+	try:
+		attributes = object.__getattribute__(obj, '__dict__')
+	except AttributeError:
+		attributes = None
+	
+	if attributes and name in attributes:
+		return attributes[name]
+	
+	return lookup_static(type(obj), name)
+
+
+def _options(obj):
+	"""Determine the HTTP methods accepted by the given object, as `opts` would, or None."""
+	
+	if not isclass(obj) and lookup_static(type(obj), '__getattr__') is not nodefault:
+		options = _attribute(obj, '__options__')  # Signature inspection would consult __getattr__, perhaps a coroutine.
+		
+		if options is not nodefault:
+			return options
+		
+		method = lookup_static(type(obj), '__call__')
+		
+		if not isinstance(method, FunctionType):
+			return None
+		
+		obj = MethodType(method, obj)
+	
+	try:
+		return opts(obj)
+	except (TypeError, ValueError):  # Some built-ins offer no signature to inspect.
+		return None
+
+
+def analyse(obj):
+	"""Determine the metadata of the given object, without consulting or populating the registry."""
+	
+	endpoint = callable(obj)
+	marker = nodefault
+	
+	if endpoint:  # Avoid invoking __getattr__ needlessly; it may even be asynchronous, producing only a coroutine.
+		marker = getattr(obj, '__dispatch__', nodefault) if isclass(obj) else _attribute(obj, '__dispatch__')
+	
+	options = _options(obj)
+	
+	return Metadata(
+			endpoint and marker is nodefault,
+			endpoint and (marker is nodefault or not marker),
+			frozenset(options) if options else None,
+		)
+
+
+def _key(obj):
+	"""Identify the registry, and key within it, applicable to the given object, or None if it must not be cached."""
+	
+	cls = type(obj)
+	
+	if cls is MethodType:
+		return _bound, obj.__func__
+	
+	if cls is FunctionType or isclass(obj):
+		return _objects, obj
+	
+	getattribute = lookup_static(cls, '__getattribute__')
+	
+	if isinstance(getattribute, FunctionType) or lookup_static(cls, '__getattr__') is not nodefault:
+		return None  # The attributes of such instances, __dispatch__ or __options__ included, may vary.
+	
+	attributes = getattr(obj, '__dict__', None)
+	
+	if attributes is not None and getattribute is not object.__getattribute__:
+		return None  # A built-in type, e.g. a module, with its own means of attribute lookup; it may vary too.
+	
+	if attributes and ('__dispatch__' in attributes or '__options__' in attributes):
+		return None  # Overridden by this instance alone.
+	
+	if callable(obj) and not isinstance(lookup_static(cls, '__call__'), FunctionType):
+		return None  # Not a method of the class; the signature belongs to the instance, e.g. a built-in function.
+	
+	return _instances, cls
+
+
+def metadata(obj):
+	"""Retrieve the metadata of the given object, analysing and remembering it when first seen."""
+	
+	key = _key(obj)
+	
+	if key is None:
+		return analyse(obj)
+	
+	registry, key = key
+	
+	try:
+		return registry[key]
+	except KeyError:
+		pass
+	except TypeError:  # Not weakly referenceable, e.g. some built-in types.
+		return analyse(obj)
+	
+	result = registry[key] = analyse(obj)
+	return result
+
+
+def prime(value):
+	"""Analyse, in advance, the given class member as dispatch will encounter it: bound to an instance, if a function.
+	
+	Intended for use at warm-up; see `ObjectDispatch.warm`.
+	"""
+	
+	if isinstance(value, FunctionType):
+		if value not in _bound:
+			_bound[value] = analyse(MethodType(value, prime))  # Any instance will do; the result does not depend on it.
+		
+		return
+	
+	if isclass(value):
+		metadata(value)
+
+
+def invalidate(obj=None):
+	"""Forget the cached metadata of the given function or class, or of all objects.
+	
+	The metadata of methods bound from the given function, or of instances of the given class, is forgotten with it.
+	"""
+	
+	if obj is None:
+		_objects.clear()
+		_bound.clear()
+		_instances.clear()
+		return
+	
+	for registry in (_objects, _bound, _instances):
+		registry.pop(obj, None)
@@ -0,0 +1,49 @@
+"""Preparation of the paths given to dispatch, accepting strings, bytes, and already split sequences of elements.
+
+Unlike `prepare_path`, which copies every path into a new deque of strings, sequences already split into lists or
+tuples are walked in place, by index, and strings and bytes are split directly, without constructing a `PurePosixPath`.
+The elements of byte strings are decoded as UTF-8, and the results cached, as the same names recur from request to
+request. They are not interned; interned strings are never freed, and path elements are chosen by the client.
+"""
+
+from functools import lru_cache
+from pathlib import PurePosixPath
+
+
+@lru_cache(4096)
+def decode(segment):
+	"""Decode a single path element. Undecodable bytes are preserved as surrogate escapes."""
+	
+	return segment.decode('utf-8', 'surrogateescape')
+
+
+def split(path):
+	"""Return the elements of the given path as an indexable sequence, without copying lists or tuples.
+	
+	Strings and bytes are split on forward slashes, ignoring empty and `.` elements, as would `PurePosixPath`.
+	"""
+	
+	if isinstance(path, (list, tuple)):
+		return path
+	
+	if isinstance(path, str):
+		return [element for element in path.split('/') if element and element != '.']
+	
+	if isinstance(path, (bytes, bytearray)):
+		return [decode(bytes(element)) for element in path.split(b'/') if element and element != b'.']
+	
+	if isinstance(path, PurePosixPath):
+		return path.parts[1 if path.root else 0:]
+	
+	return tuple(path)  # A deque or other iterable, as accepted by prepare_path.
+
+
+def extent(path):
+	"""Determine the number of elements of the given split path to dispatch, ignoring any trailing separators."""
+	
+	end = len(path)
+	
+	while end and path[end - 1] == '':
+		end -= 1
+	
+	return end
@@ -0,0 +1,124 @@
+"""Declarative policies restricting which path elements may be looked up, checked before any attribute access.
+
+A class may declare a policy as its `__dispatch_policy__` attribute, either a `Policy` instance or a mapping of the
+keyword arguments to construct one with, and a dispatcher may be given a policy applying to every class. Path elements
+rejected by either are treated exactly as protected attributes are: dispatch stops without invoking `getattr`, and thus
+without running any `__getattr__` or descriptor code belonging to the controller.
+	
+	class Users:
+		__dispatch_policy__ = {'allow': [re.compile(r'[a-z][a-z0-9_]{2,31}')], 'length': 32}
+		
+		def __getattr__(self, username):
+			return User.load(username)  # Never reached for requests such as /users/wp-login.php
+"""
+
+import re
+
+from weakref import WeakKeyDictionary
+
+
+_Pattern = type(re.compile(''))
+_compiled = WeakKeyDictionary()  # Policies declared as mappings, by class, compiled on first use.
+
+
+def _combine(patterns):
+	"""Combine the given compiled regular expressions into as few as possible, returned as a tuple.
+	
+	Only expressions compiled with identical flags, none given inline, are combined, as each must retain its own.
+	"""
+	
+	grouped = {}
+	separate = []
+	
+	for pattern in patterns:
+		if re.compile(pattern.pattern).flags != re.compile(pattern.pattern[:0]).flags:  # Flags given inline, e.g. (?i).
+			separate.append(pattern)
+			continue
+		
+		grouped.setdefault(pattern.flags, []).append(pattern)
+	
+	for flags, group in grouped.items():
+		if len(group) == 1:
+			separate.append(group[0])
+			continue
+		
+		separate.append(re.compile('|'.join('(?:' + pattern.pattern + ')' for pattern in group), flags))
+	
+	return tuple(separate)
+
+
+class Policy:
+	"""A compiled set of rules determining which path elements may be looked up.
+	
+	Path elements longer than `length`, if given, are rejected, as are those exactly matching any name given as `deny`,
+	starting with any of the given `prefixes`, or in which any regular expression given as `deny` can be found. If
+	`allow` is given, elements must additionally either exactly match one of the names or fully match one of the
+	regular expressions it contains. Names are given as strings, and regular expressions as compiled patterns.
+	"""
+	
+	__slots__ = ('length', 'names', 'prefixes', 'patterns', 'allowed', 'permitted')
+	
+	def __init__(self, allow=None, deny=(), prefixes=(), length=None):
+		self.length = length
+		self.names = frozenset(i for i in deny if isinstance(i, str))
+		self.prefixes = tuple(prefixes)
+		self.patterns = _combine([i for i in deny if isinstance(i, _Pattern)])
+		self.allowed = None if allow is None else frozenset(i for i in allow if isinstance(i, str))
+		self.permitted = () if allow is None else _combine([i for i in allow if isinstance(i, _Pattern)])
+	
+	def __repr__(self):
+		return "Policy(length={self.length!r}, deny={count}, prefixes={self.prefixes!r}, allow={allow})".format(
+				self = self,
+				count = len(self.names) + len(self.patterns),
+				allow = 'any' if self.allowed is None else len(self.allowed) + len(self.permitted),
+			)
+	
+	def __call__(self, name):
+		"""Determine if the given path element is permitted by this policy."""
+		
+		if self.length is not None and len(name) > self.length:
+			return False
+		
+		if name in self.names or (self.prefixes and name.startswith(self.prefixes)):
+			return False
+		
+		for pattern in self.patterns:
+			if pattern.search(name):
+				return False
+		
+		if self.allowed is None or name in self.allowed:
+			return True
+		
+		for pattern in self.permitted:
+			if pattern.fullmatch(name):
+				return True
+		
+		return False
+
+
+def policy(cls):
+	"""Retrieve the compiled policy declared by the given class, or None if it declares none."""
+	
+	declared = getattr(cls, '__dispatch_policy__', None)
+	
+	if declared is None or isinstance(declared, Policy):
+		return declared
+	
+	try:
+		return _compiled[cls]
+	except KeyError:
+		pass
+	
+	compiled = _compiled[cls] = Policy(**declared)
+	return compiled
+
+
+def permits(cls, name, default=None):
+	"""Determine if the policies of the given class and the given default policy, if any, both permit the name."""
+	
+	declared = policy(cls)
+	
+	if declared is not None and not declared(name):
+		return False
+	
+	return default is None or default(name)
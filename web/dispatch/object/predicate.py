@@ -0,0 +1,19 @@
+"""Type predicates used along the dispatch path.
+
+Equivalent to those of the `inspect` module, defined here so that dispatch does not require that module; it is
+imported only by trace, which requires signatures.
+"""
+
+from types import BuiltinFunctionType
+
+
+def isclass(obj):
+	"""Return true if the object is a class."""
+	
+	return isinstance(obj, type)
+
+
+def isbuiltin(obj):
+	"""Return true if the object is a built-in function or method."""
+	
+	return isinstance(obj, BuiltinFunctionType)
@@ -0,0 +1,149 @@
+"""Reverse routing: the generation of paths to endpoints, e.g. for the construction of links.
+
+A `ReverseIndex` maps endpoints, and the classes leading to them, to the path templates by which dispatch reaches them,
+as discovered by `walk`. Segments handled by `__getattr__` appear within templates as `{param}` placeholders, filled
+from keyword arguments when generating a path:
+	
+	index = ReverseIndex().mount(Root)
+	index.path(Person.foo, username='alice')  # '/user/alice/foo'
+
+Trees are walked incrementally: a lookup which can not be answered from the routes already indexed continues walking
+only until the object sought is found. Once indexed, lookup is a single dictionary access.
+"""
+
+import re
+
+from threading import Lock
+from urllib.parse import quote
+
+from .dispatch import ObjectDispatch
+from .predicate import isclass
+
+
+PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+
+def key(obj):
+	"""The object routes are indexed by: the function underlying a method, regardless of the instance it is bound to."""
+	
+	return getattr(obj, '__func__', obj)
+
+
+class ReverseIndex:
+	"""An index of the path templates reaching each object within one or more mounted controller trees.
+	
+	The same object may be reachable by many paths, e.g. if mounted more than once, or shared by several classes; its
+	templates are kept in the order discovered. Trees are walked using the given dispatcher, by default one performing
+	static trace, which does not evaluate properties or other descriptors.
+	"""
+	
+	__slots__ = ('dispatch', 'context', 'routes', '_pending', '_lock')
+	
+	def __init__(self, dispatch=None, context=None):
+		self.dispatch = ObjectDispatch(static=True) if dispatch is None else dispatch
+		self.context = context
+		self.routes = {}  # Mapping of indexed object to a tuple of (template, placeholders) pairs.
+		self._pending = []  # Walks not yet exhausted, as (prefix, iterator) pairs.
+		self._lock = Lock()
+	
+	def __repr__(self):
+		return "ReverseIndex({count} objects, {pending} pending)".format(
+				count = len(self.routes),
+				pending = len(self._pending),
+			)
+	
+	def __contains__(self, obj):
+		return bool(self.templates(obj))
+	
+	def mount(self, root, prefix=''):
+		"""Make the routes beneath the given root available at the given path prefix; they are indexed as needed.
+		
+		Returns the index, allowing mounts to be chained.
+		"""
+		
+		routes = self.dispatch.walk(self.context, root)
+		
+		with self._lock:
+			self._pending.append((prefix.rstrip('/'), routes))
+		
+		return self
+	
+	def build(self):
+		"""Index all mounted routes immediately, rather than as required by lookups."""
+		
+		with self._lock:
+			while self._pending:
+				self._advance()
+	
+	def _advance(self, target=None):
+		"""Index routes from the oldest pending walk, stopping early if the given object is found."""
+		
+		prefix, routes = self._pending[0]
+		
+		for route in routes:
+			if not route.endpoint and not isclass(route.handler):  # E.g. a static string attribute.
+				continue
+			
+			obj = key(route.handler)
+			self._add(obj, prefix + route.path if route.path != '/' else (prefix or '/'))
+			
+			if obj is target:
+				return
+		
+		del self._pending[0]
+	
+	def _add(self, obj, template):
+		entry = (template, frozenset(PLACEHOLDER.findall(template)))
+		
+		try:
+			self.routes[obj] = self.routes.get(obj, ()) + (entry, )
+		except TypeError:  # Unhashable; such objects can not be looked up.
+			pass
+	
+	def templates(self, obj):
+		"""Retrieve the path templates reaching the given object, in order of discovery, walking further if needed.
+		
+		Templates are only ever added by walking further, so the result may grow should further walking be required by
+		the lookup of another object; the first templates found never change.
+		"""
+		
+		obj = key(obj)
+		found = self.routes.get(obj)
+		
+		if found is None and self._pending:
+			with self._lock:
+				while obj not in self.routes and self._pending:
+					self._advance(obj)
+			
+			found = self.routes.get(obj)
+		
+		return tuple(template for template, placeholders in found) if found else ()
+	
+	def path(self, obj, **params):
+		"""Generate a path to the given object, filling the placeholders of its template from the given arguments.
+		
+		The first template discovered whose placeholders are all given is used. Values are converted to strings, and
+		quoted, so that each fills exactly one path segment. Raises `LookupError` if no such template exists.
+		"""
+		
+		obj = key(obj)
+		
+		if obj not in self.routes:
+			self.templates(obj)
+		
+		while True:
+			for template, placeholders in self.routes.get(obj, ()):
+				if not placeholders:
+					return template
+				
+				if placeholders <= params.keys():
+					return PLACEHOLDER.sub(lambda match: quote(str(params[match.group(1)]), safe=''), template)
+			
+			if not self._pending:
+				break
+			
+			with self._lock:  # The templates found so far do not suffice; look for others.
+				if self._pending:
+					self._advance()
+		
+		raise LookupError("No route to {!r} accepting parameters: {}".format(obj, ', '.join(sorted(params)) or 'none'))
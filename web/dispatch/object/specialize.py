@@ -0,0 +1,200 @@
+"""Resolvers generated for, and compiled against, the static structure of a particular controller tree.
+
+Where generic dispatch determines, at each step, whether the object reached is a class, if the path element is
+protected, and what kind of attribute it names, a specialized resolver has these answers written into its code. For
+each class reachable through nested classes, straight-line code instantiates it, then selects the next branch by
+a single dictionary lookup of the path element. Anything not known in advance, such as attributes provided by
+`__getattr__`, instance attributes, protected or unknown names, and the end of the path, is handed to the generic
+dispatcher, which resumes from that point. The crumbs produced are identical to those of generic dispatch.
+	
+	resolver = dispatch.specialize(Root)
+	print(resolver.source)
+	
+	for crumb in resolver(context, '/foo/bar'):
+		...
+
+The code reflects the tree as it was when generated; specialize it again after modifying its classes at runtime.
+"""
+
+from inspect import iscoroutinefunction
+
+from ..core import Crumb, nodefault
+from .cache import CLASS, ATTRIBUTE, AttributeCache
+from .introspect import members
+from .path import split, extent
+from .predicate import isclass
+
+
+class Resolver:
+	"""A generated resolver, called with a context and path, producing the same crumbs as the dispatcher it was
+	specialized from would for its root."""
+	
+	__slots__ = ('dispatch', 'root', 'source', 'function')
+	
+	def __init__(self, dispatch, root, source, function):
+		self.dispatch = dispatch
+		self.root = root
+		self.source = source  # The generated Python source code, for inspection.
+		self.function = function
+	
+	def __repr__(self):
+		return "Resolver({self.root.__qualname__}, {lines} lines)".format(self=self, lines=self.source.count('\n'))
+	
+	def __call__(self, context, path):
+		return self.function(context, path)
+
+
+class Generator:
+	"""Accumulate the source of a resolver, and the constants it references."""
+	
+	__slots__ = ('classifier', 'depth', 'limit', 'lines', 'namespace', 'nodes')
+	
+	def __init__(self, dispatch, root, depth, limit):
+		self.classifier = AttributeCache(protect=dispatch.protect, policy=dispatch.policy)
+		self.depth = depth
+		self.limit = limit
+		self.lines = []
+		self.nodes = 0
+		self.namespace = {
+				'dispatch': dispatch,
+				'root': root,
+				'split': split,
+				'extent': extent,
+				'instantiate': dispatch._instantiate,
+				'resume': dispatch._descend,
+				'make': tuple.__new__,  # Crumbs are constructed directly, their values being prepared in advance.
+				'Crumb': Crumb,
+				'nodefault': nodefault,
+				'EMPTY': {},
+			}
+	
+	def constant(self, value, prefix):
+		"""Make the given value available to the generated code, returning the name it may be referenced by."""
+		
+		name = '{}{}'.format(prefix, len(self.namespace))
+		self.namespace[name] = value
+		return name
+	
+	def emit(self, indent, *lines):
+		self.lines.extend(('\t' * indent + line) if line else '' for line in lines)
+	
+	def switch(self, cls):
+		"""Classify the attributes of the given class, returning the nested classes, by name, and other static names."""
+		
+		classes = {}
+		attributes = []
+		
+		for name, value in members(cls):
+			kind, value = self.classifier.classify(cls, name)
+			
+			if kind is CLASS:
+				classes[name] = value
+			
+			elif kind is ATTRIBUTE:
+				attributes.append(name)
+		
+		return classes, attributes
+	
+	def node(self, cls, level, indent, trail, ancestors):
+		"""Emit the code handling arrival at the given class by way of the given path elements, and its descendants."""
+		
+		self.nodes += 1
+		edge = trail[-1] if trail else None
+		target = self.constant(cls, 'C')
+		previous = 'None' if edge is None else self.constant(Crumb.Path(edge), 'P')
+		classes, attributes = self.switch(cls)
+		branches = {name: index for index, name in enumerate(classes, 1)}
+		branches.update((name, -1) for name in attributes)
+		table = self.constant(branches, 'S')
+		ancestors = ancestors + (cls, )
+		
+		self.emit(indent,
+				"# /{}: {}".format('/'.join(trail), cls.__qualname__),
+				"if end == {}:".format(level),
+				"	yield from resume(context, root, {}, path, {}, end, {!r}, {!r})".format(target, level, edge, edge),
+				"	return",
+				"",
+				"obj = instantiate({}, context)".format(target),
+				"yield make(Crumb, (dispatch, root, None, False, obj, None))",
+				"current = path[{}]".format(level),
+				"branch = {}.get(current, 0)".format(table),
+				"",
+				"if branch == 0 or (branch > 0 and current in getattr(obj, '__dict__', EMPTY)):  # Not static, or shadowed.",
+				"	yield from resume(context, root, obj, path, {}, end, {!r}, current)".format(level, edge),
+				"	return",
+				"",
+			)
+		
+		if attributes:
+			self.emit(indent,
+					"if branch < 0:  # A method, or other static attribute.",
+					"	found = getattr(obj, current, nodefault)",
+					"	",
+					"	if found is nodefault:",
+					"		yield from resume(context, root, obj, path, {}, end, {!r}, current)".format(level, edge),
+					"		return",
+					"	",
+					"	yield make(Crumb, (dispatch, root, {}, False, obj, None))".format(previous),
+					"	yield from resume(context, root, found, path, {}, end, current, current)".format(level + 1),
+					"	return",
+					"",
+				)
+		
+		if not classes:
+			return
+		
+		self.emit(indent, "yield make(Crumb, (dispatch, root, {}, False, obj, None))".format(previous), "")
+		
+		for index, (name, child) in enumerate(classes.items(), 1):
+			self.emit(indent, "{} branch == {}:  # {}".format('if' if index == 1 else 'elif', index, name))
+			
+			if level + 1 >= self.depth or self.nodes >= self.limit or any(child is i for i in ancestors):
+				self.emit(indent + 1, "yield from resume(context, root, {}, path, {}, end, {!r}, {!r})".format(
+						self.constant(child, 'C'), level + 1, name, name))  # Beyond what is generated; walk generically.
+				continue
+			
+			self.node(child, level + 1, indent + 1, trail + (name, ), ancestors)
+	
+	def build(self, root):
+		self.emit(0,
+				"def resolve(context, path):",
+				"	if dispatch.hooks:  # Listeners expect events, and their timing, as generic dispatch emits them.",
+				"		yield from dispatch(context, root, path)",
+				"		return",
+				"	",
+				"	path = split(path)",
+				"	end = extent(path)",
+				"	",
+			)
+		
+		self.node(root, 0, 1, (), ())
+		
+		return '\n'.join(self.lines) + '\n'
+
+
+def specialize(dispatch, root, depth=16, limit=1000):
+	"""Generate and compile a resolver for the given root class, producing the crumbs the given dispatcher would.
+	
+	Code is generated for classes nested at most `depth` elements deep, and at most `limit` classes in total, beyond
+	which, as for recursive structures, generic dispatch resumes. Lazy and asynchronous dispatchers are not supported.
+	"""
+	
+	if not isclass(root):
+		raise TypeError("Only classes may be specialized, not: {!r}".format(root))
+	
+	if dispatch.lazy:
+		raise ValueError("Specialized resolvers perform eager dispatch only.")
+	
+	if iscoroutinefunction(dispatch.resolve):
+		raise ValueError("Specialized resolvers perform synchronous dispatch only.")
+	
+	generator = Generator(dispatch, root, depth, limit)
+	source = generator.build(root)
+	filename = '<specialized {}.{}>'.format(root.__module__, root.__qualname__)
+	
+	import linecache
+	
+	exec(compile(source, filename, 'exec'), generator.namespace)
+	linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)  # Permit tracebacks to quote.
+	
+	return Resolver(dispatch, root, source, generator.namespace['resolve'])
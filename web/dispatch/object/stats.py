@@ -0,0 +1,260 @@
+"""Aggregate statistics of dispatch, collected by a listener, for the identification of hot and expensive routes.
+
+Attach a `Statistics` instance to a dispatcher as a listener, then periodically export a `snapshot` of the counts and
+latency histograms it has collected, e.g. as JSON, for the route prefixes and controller classes encountered:
+	
+	stats = Statistics(depth=2)
+	dispatch = ObjectDispatch(listeners=[stats])
+	
+	json.dumps(stats.snapshot())
+
+Memory use is fixed: histograms are of a constant number of buckets, and at most `limit` prefixes, and classes, are
+tracked individually. Any beyond this are aggregated together, under the key `*`, so that requests for arbitrary
+paths, such as those of vulnerability scanners, can not exhaust memory.
+"""
+
+from bisect import bisect_left
+from threading import Lock
+
+from ..core import nodefault
+from .cache import lookup_static
+from .predicate import isclass
+
+
+BOUNDS = tuple(1e-6 * 2 ** i for i in range(24))  # The upper bound of each histogram bucket, in seconds: 1µs to ~8s.
+OTHER = '*'  # The key under which prefixes and classes beyond the tracking limit are aggregated.
+
+
+class Histogram:
+	"""A fixed-size histogram of durations, in seconds, in exponentially widening buckets.
+	
+	Each bucket counts the durations not exceeding its bound, given by `BOUNDS`, but exceeding that of the bucket
+	before it; a final bucket counts any exceeding every bound. Quantiles are thus estimates, accurate to within a
+	factor of two.
+	"""
+	
+	__slots__ = ('counts', 'total', 'minimum', 'maximum')
+	
+	def __init__(self):
+		self.counts = [0] * (len(BOUNDS) + 1)
+		self.total = 0.0
+		self.minimum = None
+		self.maximum = None
+	
+	def __repr__(self):
+		return "Histogram(count={count}, total={self.total!r})".format(self=self, count=len(self))
+	
+	def __len__(self):
+		return sum(self.counts)
+	
+	def add(self, duration):
+		"""Record the given duration."""
+		
+		self.counts[bisect_left(BOUNDS, duration)] += 1
+		self.total += duration
+		
+		if self.minimum is None or duration < self.minimum:
+			self.minimum = duration
+		
+		if self.maximum is None or duration > self.maximum:
+			self.maximum = duration
+	
+	def quantile(self, fraction):
+		"""Estimate the given quantile, as the bound of the bucket it falls within, or None if empty."""
+		
+		rank = fraction * len(self)
+		running = 0
+		
+		for bound, count in zip(BOUNDS + (self.maximum, ), self.counts):
+			running += count
+			
+			if count and running >= rank:
+				return min(bound, self.maximum)
+		
+		return None
+	
+	def snapshot(self):
+		"""Export the content of this histogram as a mapping, including only non-empty buckets.
+		
+		Buckets are listed as `[bound, count]` pairs; the bound of the final bucket, being unbounded, is None.
+		"""
+		
+		count = len(self)
+		
+		return {
+				'count': count,
+				'total': self.total,
+				'mean': self.total / count if count else None,
+				'min': self.minimum,
+				'max': self.maximum,
+				'p50': self.quantile(0.5),
+				'p95': self.quantile(0.95),
+				'p99': self.quantile(0.99),
+				'buckets': [[bound, count] for bound, count in zip(BOUNDS + (None, ), self.counts) if count],
+			}
+
+
+class _Prefix:
+	"""The statistics of the dispatch of paths sharing a prefix."""
+	
+	__slots__ = ('count', 'endpoints', 'interrupted', 'duration')
+	
+	def __init__(self):
+		self.count = 0  # Paths dispatched.
+		self.endpoints = 0  # Those concluding at an endpoint.
+		self.interrupted = 0  # Those interrupted by a path element which could not be resolved.
+		self.duration = Histogram()
+	
+	def snapshot(self):
+		return {
+				'count': self.count,
+				'endpoints': self.endpoints,
+				'interrupted': self.interrupted,
+				'duration': self.duration.snapshot(),
+			}
+
+
+class _Controller:
+	"""The statistics of dispatch through a class, or instances of it."""
+	
+	__slots__ = ('instantiated', 'misses', 'protected', 'construction', 'step', 'dynamic')
+	
+	def __init__(self):
+		self.instantiated = 0
+		self.misses = 0
+		self.protected = 0
+		self.construction = Histogram()  # Time spent within the constructor.
+		self.step = Histogram()  # Time spent retrieving any attribute, or failing to.
+		self.dynamic = Histogram()  # Time spent within __getattr__ specifically.
+	
+	def snapshot(self):
+		return {
+				'instantiated': self.instantiated,
+				'misses': self.misses,
+				'protected': self.protected,
+				'construction': self.construction.snapshot(),
+				'step': self.step.snapshot(),
+				'dynamic': self.dynamic.snapshot(),
+			}
+
+
+def name(cls):
+	"""The fully qualified name of a class, as used to identify it within a snapshot."""
+	
+	return cls if cls is OTHER else '{}.{}'.format(cls.__module__, cls.__qualname__)
+
+
+def dynamic(cls, segment):
+	"""Determine if the given path element would be resolved by the `__getattr__` method of the given class."""
+	
+	return lookup_static(cls, segment) is nodefault and lookup_static(cls, '__getattr__') is not nodefault
+
+
+class Statistics:
+	"""A dispatch listener aggregating counts and latency histograms per route prefix and per controller class.
+	
+	Routes are grouped by their first `depth` consumed path elements, e.g. `/users/alice/posts` under `/users/alice`
+	at the default depth of two. Per class, the number of instances constructed, and the number of misses and protected
+	rejections when retrieving attributes from it, are counted; the time spent within the constructor, retrieving each
+	attribute, and within `__getattr__`, are accumulated as histograms.
+	
+	Listeners are invoked synchronously by the dispatching thread; updates are serialized using a lock, so a single
+	collector may be shared by dispatchers used by many threads.
+	"""
+	
+	__slots__ = ('depth', 'limit', 'prefixes', 'classes', '_lock')
+	
+	def __init__(self, depth=2, limit=1000):
+		self.depth = depth
+		self.limit = limit
+		self.prefixes = {}  # Mapping of route prefix to _Prefix.
+		self.classes = {}  # Mapping of class to _Controller.
+		self._lock = Lock()
+	
+	def __repr__(self):
+		return "Statistics(depth={self.depth}, prefixes={prefixes}, classes={classes})".format(
+				self = self,
+				prefixes = len(self.prefixes),
+				classes = len(self.classes),
+			)
+	
+	def __call__(self, dispatcher, event, context, handler=None, segment=None, duration=None, **data):
+		with self._lock:
+			if event == 'terminus':
+				self._conclude(data['path'], segment, data['endpoint'], duration)
+				return
+			
+			if event == 'descend':  # Attributed to the object the attribute was retrieved from.
+				handler = data['parent']
+			
+			cls = handler if isclass(handler) and event != 'instantiate' else type(handler)
+			controller = self._entry(self.classes, cls, _Controller)
+			
+			if event == 'instantiate':
+				controller.instantiated += 1
+				
+				if duration is not None:
+					controller.construction.add(duration)
+				
+				return
+			
+			if event == 'protected':
+				controller.protected += 1
+				return
+			
+			if event == 'miss':
+				controller.misses += 1
+			
+			if duration is not None:
+				controller.step.add(duration)
+				
+				if dynamic(cls, segment):
+					controller.dynamic.add(duration)
+	
+	def _entry(self, collection, key, factory):
+		"""Retrieve the statistics for the given key, creating them if not yet at the limit, else those of `OTHER`."""
+		
+		entry = collection.get(key)
+		
+		if entry is None:
+			if len(collection) >= self.limit:
+				key = OTHER
+				entry = collection.get(key)
+			
+			if entry is None:
+				entry = collection[key] = factory()
+		
+		return entry
+	
+	def _conclude(self, path, segment, endpoint, duration):
+		prefix = self._entry(self.prefixes, '/' + '/'.join(path[:self.depth]), _Prefix)
+		prefix.count += 1
+		
+		if endpoint:
+			prefix.endpoints += 1
+		
+		if segment is not None:
+			prefix.interrupted += 1
+		
+		if duration is not None:
+			prefix.duration.add(duration)
+	
+	def reset(self):
+		"""Discard all statistics collected so far."""
+		
+		with self._lock:
+			self.prefixes = {}
+			self.classes = {}
+	
+	def snapshot(self):
+		"""Export the statistics collected so far as a mapping of plain values, suitable for serialization as JSON.
+		
+		The result contains a `prefixes` mapping of route prefix, and a `classes` mapping of qualified class name, to
+		their respective statistics, with durations given in seconds.
+		"""
+		
+		with self._lock:
+			return {
+					'prefixes': {prefix: entry.snapshot() for prefix, entry in self.prefixes.items()},
+					'classes': {name(cls): entry.snapshot() for cls, entry in self.classes.items()},
+				}
@@ -0,0 +1,136 @@
+"""Ahead-of-time compilation of the static structure of a controller tree.
+
+Walking a tree of controller classes once, the kind of every attribute reachable through nested classes is recorded,
+exactly as the `AttributeCache` would classify it during dispatch. The resulting table may be written to disk, and
+loaded by new processes to populate the attribute cache of their dispatcher at startup, rather than it being populated
+lazily by the first requests. Only static structure is compiled: classes providing `__getattr__` are compiled up to
+that boundary, after which dispatch proceeds dynamically, as usual.
+"""
+
+import json
+
+from importlib import import_module
+from pathlib import Path
+
+from .cache import PROTECTED, MISSING, DYNAMIC, CLASS, ATTRIBUTE, AttributeCache
+from .introspect import members
+from .predicate import isclass
+
+
+def reference(obj):
+	"""Produce an importable reference to the given class, in `module:qualified.name` form."""
+	
+	return obj.__module__ + ':' + obj.__qualname__
+
+
+def resolve(ref):
+	"""Import the object referenced in `module:qualified.name` form."""
+	
+	module, _, name = ref.partition(':')
+	obj = import_module(module)
+	
+	for part in name.split('.'):
+		obj = getattr(obj, part)
+	
+	return obj
+
+
+class RouteTable:
+	"""A flat mapping of `(class, segment)` to the classification of that attribute, as used by `AttributeCache`."""
+	
+	__slots__ = ('protect', 'entries')
+	
+	VERSION = 1
+	
+	def __init__(self, entries=None, protect=True):
+		self.protect = protect
+		self.entries = dict(entries or ())
+	
+	def __repr__(self):
+		return "RouteTable({count} entries, protect={self.protect!r})".format(count=len(self.entries), self=self)
+	
+	def __len__(self):
+		return len(self.entries)
+	
+	def __iter__(self):
+		return iter(self.entries.items())
+	
+	@classmethod
+	def compile(cls, root, protect=True):
+		"""Walk the static structure of the given controller class, recording the classification of each attribute."""
+		
+		classifier = AttributeCache(protect=protect)
+		entries = {}
+		pending = [root if isclass(root) else type(root)]
+		seen = set(pending)
+		
+		while pending:
+			current = pending.pop()
+			
+			for name, value in members(current):
+				kind, value = entry = classifier.classify(current, name)
+				
+				if kind is PROTECTED or kind is MISSING or kind is DYNAMIC:
+					continue
+				
+				entries[current, name] = entry
+				
+				if kind is CLASS and value not in seen:
+					seen.add(value)
+					pending.append(value)
+		
+		return cls(entries, protect)
+	
+	def install(self, cache):
+		"""Populate the given attribute cache with the entries of this table, omitting any rejected by its policy."""
+		
+		if cache.protect != self.protect:
+			raise ValueError("Attribute cache and route table disagree on protection.")
+		
+		policy = cache.policy
+		
+		for key, entry in self.entries.items():
+			if policy is None or policy(key[1]):
+				cache.set(key, entry)
+	
+	def dump(self, path):
+		"""Write this table to the given file as JSON. Entries involving classes that can not be imported are omitted."""
+		
+		entries = []
+		
+		for (owner, name), (kind, value) in self.entries.items():
+			try:
+				refs = [reference(owner)] + ([reference(value)] if kind is CLASS else [])
+				
+				if any(resolve(ref) is not obj for ref, obj in zip(refs, (owner, value))):
+					continue
+			
+			except (AttributeError, ImportError):
+				continue
+			
+			entries.append([refs[0], name, kind, refs[1] if kind is CLASS else None])
+		
+		Path(path).write_text(json.dumps({'version': self.VERSION, 'protect': self.protect, 'entries': entries}))
+	
+	@classmethod
+	def load(cls, path):
+		"""Read a table previously written using `dump`, omitting entries which can no longer be resolved."""
+		
+		data = json.loads(Path(path).read_text())
+		
+		if data.get('version') != cls.VERSION:
+			raise ValueError("Unsupported route table version: " + repr(data.get('version')))
+		
+		kinds = {CLASS: CLASS, ATTRIBUTE: ATTRIBUTE}  # Restore the identity of the classification constants.
+		entries = {}
+		
+		for owner, name, kind, value in data['entries']:
+			try:
+				owner = resolve(owner)
+				value = resolve(value) if value else None
+			except (AttributeError, ImportError):
+				continue
+			
+			entries[owner, name] = (kinds[kind], value)
+		
+		return cls(entries, data['protect'])
@@ -0,0 +1,82 @@
+"""Recursive enumeration of every route reachable from a given root, built upon trace."""
+
+from collections import namedtuple
+from itertools import islice
+
+from ..core import nodefault
+from .cache import lookup_static
+from .predicate import isclass
+
+
+Route = namedtuple('Route', ('path', 'endpoint', 'handler', 'options'))
+Route.__doc__ = """A route discovered by walking: its full path, if it is an endpoint, its handler, and endpoint options."""
+
+
+def descendable(obj):
+	"""Determine if the given object is a class which object dispatch would instantiate and descend into."""
+	
+	return isclass(obj) and getattr(obj, '__dispatch__', 'object') == 'object'
+
+
+def node(path, obj):
+	"""Produce the route describing a node of the tree itself, i.e. a class or the root."""
+	
+	if isclass(obj):
+		endpoint = lookup_static(obj, '__call__') is not nodefault and not hasattr(obj, '__dispatch__')
+	else:
+		endpoint = callable(obj) and not hasattr(obj, '__dispatch__')
+	
+	return Route(path, endpoint, obj, None)
+
+
+def subtree(dispatch, context, obj, prefix, ancestors, depth):
+	"""Enumerate the routes beneath the given node, depth-first, excluding the node itself.
+	
+	Only the traces of the nodes between the root and the current position are held at any time. A class is not
+	descended into if it is already one of its own ancestors, as happens with self-referencing structures; its route is
+	still produced.
+	"""
+	
+	stack = [(prefix, dispatch.trace(context, obj), ancestors)]
+	
+	while stack:
+		prefix, children, ancestors = stack[-1]
+		
+		for crumb in children:
+			if crumb.path is None:  # The node's own __call__; already described by its parent.
+				continue
+			
+			path = prefix + '/' + str(crumb.path)
+			handler = crumb.handler
+			
+			if not descendable(handler):
+				yield Route(path, crumb.endpoint, handler, crumb.options)
+				continue
+			
+			yield node(path, handler)
+			
+			if (depth is None or len(ancestors) < depth) and not any(handler is i for i in ancestors):
+				stack.append((path, dispatch.trace(context, handler), ancestors + (handler, )))
+				break
+		
+		else:
+			stack.pop()
+
+
+def walk(dispatch, context, obj, depth=None, limit=None):
+	"""Lazily enumerate all routes reachable from the given root object, as `Route` tuples, beginning with the root.
+	
+	Paths are joined using forward slashes; segments handled by `__getattr__` are represented by the `{param}`
+	placeholder produced by trace. Enumeration stops after `limit` routes, if given, and does not descend more than
+	`depth` segments deep.
+	"""
+	
+	if limit is not None and limit <= 0:
+		return
+	
+	yield node('/', obj)
+	
+	if depth is not None and depth < 1:
+		return
+	
+	yield from islice(subtree(dispatch, context, obj, '', (obj, ), depth), None if limit is None else limit - 1)